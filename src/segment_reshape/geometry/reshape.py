@@ -17,15 +17,19 @@
 #  You should have received a copy of the GNU General Public License
 #  along with segment-reshape-qgis-plugin. If not, see <https://www.gnu.org/licenses/>.
 
-from collections.abc import Iterator
+import math
+from collections.abc import Callable, Iterator, Sequence
 from contextlib import contextmanager
-from contextvars import ContextVar
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from enum import IntEnum
 from typing import Optional, Union
 
 from qgis.core import (
+    QgsAbstractGeometry,
+    QgsCurvePolygon,
     QgsFeature,
     QgsGeometry,
+    QgsGeometryCollection,
     QgsLineString,
     QgsPoint,
     QgsVectorLayer,
@@ -64,44 +68,61 @@ class ReshapeEdge:
     """
 
 
-_current_edit_command_layers: ContextVar[list[QgsVectorLayer]] = ContextVar(
-    "current_edit_command_layers"
-)
-_set_editable_layer_ids: ContextVar[set[str]] = ContextVar("set_editable_layer_ids")
+@dataclass
+class _EditSession:
+    edit_command_layers: list[tuple[str, QgsVectorLayer]] = field(default_factory=list)
+    set_editable_layer_ids: set[str] = field(default_factory=set)
+    handled_layers: set[int] = field(default_factory=set)
+    """
+    Python ids of the layers already checked for editing in this session.
+    """
+    pending_geometry_updates: dict[
+        str, tuple[QgsVectorLayer, dict[int, QgsGeometry]]
+    ] = field(default_factory=dict)
+    """
+    Geometry changes to apply for each layer id when all edits are done.
+    """
 
 
 @contextmanager
-def _wrap_all_edit_commands() -> Iterator[None]:
-    layers: list[QgsVectorLayer] = []
-    set_editable_ids: set[str] = set()
-    token = _current_edit_command_layers.set(layers)
-    editable_ids_token = _set_editable_layer_ids.set(set_editable_ids)
+def _wrap_all_edit_commands() -> Iterator[_EditSession]:
+    session = _EditSession()
     try:
-        yield
-        for layer in layers:
+        yield session
+        # apply all the collected geometry changes layer by layer before
+        # ending any edit command, so that a failure can still be rolled back.
+        # layers are edited serially on the calling thread, since the edit
+        # buffer, undo stack and signals of a layer belong to its thread
+        for layer, new_geometries in session.pending_geometry_updates.values():
+            _change_geometries(layer, new_geometries)
+        for _, layer in session.edit_command_layers:
             layer.endEditCommand()
     except GeometryTransformationError as e:
-        for layer in layers:
+        for layer_id, layer in session.edit_command_layers:
             layer.destroyEditCommand()
-            if layer.id() in set_editable_ids:
+            if layer_id in session.set_editable_layer_ids:
                 layer.rollBack()
         raise e
-    finally:
-        _current_edit_command_layers.reset(token)
-        _set_editable_layer_ids.reset(editable_ids_token)
 
 
-def _set_editable_and_begin_edit_command_once(layer: QgsVectorLayer) -> None:
+def _set_editable_and_begin_edit_command_once(
+    layer: QgsVectorLayer, session: _EditSession, layer_id: str
+) -> None:
+    # the layer state can only change through this session after the first check
+    if id(layer) in session.handled_layers:
+        return
+    session.handled_layers.add(id(layer))
+
     if layer.isEditCommandActive():
         return
 
     if not layer.isEditable():
         if not layer.startEditing():
             raise GeometryTransformationError(f"could not start editing on {layer}")
-        _set_editable_layer_ids.get().add(layer.id())
+        session.set_editable_layer_ids.add(layer_id)
 
     layer.beginEditCommand("Reshape segment")
-    _current_edit_command_layers.get().append(layer)
+    session.edit_command_layers.append((layer_id, layer))
 
 
 def make_reshape_edits(
@@ -122,228 +143,811 @@ def make_reshape_edits(
 
     # no crs support yet
 
-    with _wrap_all_edit_commands():
-        _reshape_common_parts(common_parts, reshape_geometry)
-        if isinstance(reshape_geometry, QgsPoint):
-            _move_edges(edges, reshape_geometry, reshape_geometry)
-        else:
-            _move_edges(
-                edges,
-                reshape_geometry.startPoint(),
-                reshape_geometry.endPoint(),
-            )
+    if not common_parts and not edges:
+        return
+
+    # check the reshape geometry type only once for the whole reshape
+    if isinstance(reshape_geometry, QgsPoint):
+        _apply_point_reshape(common_parts, edges, reshape_geometry)
+    else:
+        _apply_line_reshape(common_parts, edges, reshape_geometry)
+
+
+def _apply_point_reshape(
+    common_parts: list[ReshapeCommonPart],
+    edges: list[ReshapeEdge],
+    reshape_point: QgsPoint,
+) -> None:
+    with _wrap_all_edit_commands() as session:
+        _reshape_common_parts(
+            common_parts,
+            _reshape_geometry_to_point,
+            reshape_point,
+            reshape_point,
+            session,
+        )
+        _move_edges(edges, reshape_point, reshape_point, session)
+
+
+def _apply_line_reshape(
+    common_parts: list[ReshapeCommonPart],
+    edges: list[ReshapeEdge],
+    reshape_line: QgsLineString,
+) -> None:
+    # reverse the line only once for all the reversed common parts
+    reversed_reshape_line = (
+        reshape_line.reversed()
+        if any(common_part.is_reversed for common_part in common_parts)
+        else reshape_line
+    )
+
+    with _wrap_all_edit_commands() as session:
+        _reshape_common_parts(
+            common_parts,
+            _reshape_geometry_to_line,
+            reshape_line,
+            reversed_reshape_line,
+            session,
+        )
+        _move_edges(edges, reshape_line.startPoint(), reshape_line.endPoint(), session)
 
 
 def _reshape_common_parts(
     common_parts: list[ReshapeCommonPart],
+    reshape_part: Callable[..., QgsGeometry],
     reshape_geometry: Union[QgsPoint, QgsLineString],
+    reversed_reshape_geometry: Union[QgsPoint, QgsLineString],
+    session: _EditSession,
 ) -> None:
+    # resolve each layer id only once, most common parts are on the same layers
+    layer_ids: dict[int, str] = {}
+
     for common_part in common_parts:
-        _set_editable_and_begin_edit_command_once(common_part.layer)
-        new_geometry = _reshape_geometry(
-            common_part.feature.geometry(),
+        original_geometry = common_part.feature.geometry()
+        new_geometry = reshape_part(
+            original_geometry,
             common_part.vertex_indices,
             (
-                reshape_geometry.reversed()
-                if isinstance(reshape_geometry, QgsLineString)
-                and common_part.is_reversed
+                reversed_reshape_geometry
+                if common_part.is_reversed
                 else reshape_geometry
             ),
         )
+        # no need to edit the layer if the reshape did not change the geometry
+        if new_geometry.equals(original_geometry):
+            continue
+
+        layer_id = layer_ids.get(id(common_part.layer))
+        if layer_id is None:
+            layer_id = layer_ids[id(common_part.layer)] = common_part.layer.id()
+        _set_editable_and_begin_edit_command_once(common_part.layer, session, layer_id)
+
         _update_geometry_to_layer_feature(
             common_part.layer,
+            layer_id,
             common_part.feature,
             new_geometry,
+            session,
         )
 
 
-def _reshape_geometry(  # noqa: C901, PLR0912
+def _reshape_geometry_to_point(
     original: QgsGeometry,
     vertex_indices: list[int],
-    reshape_geometry: Union[QgsPoint, QgsLineString],
+    reshape_geometry: QgsPoint,
+) -> QgsGeometry:
+    index_range = _index_range(vertex_indices)
+    _validate_index_range(original, index_range)
+
+    collapsed = _collapse_geometry(
+        original, vertex_indices, index_range, reshape_geometry
+    )
+    if collapsed is not None:
+        return collapsed
+    # fall back to editing vertex by vertex if the indices do not
+    # target a single linestring part or ring (e.g. multipoints),
+    # or if the ring collapses and is removed
+    return _collapse_vertex_by_vertex(original, vertex_indices, reshape_geometry)
+
+
+def _reshape_geometry_to_line(
+    original: QgsGeometry,
+    vertex_indices: list[int],
+    reshape_geometry: QgsLineString,
+) -> QgsGeometry:
+    index_range = _index_range(vertex_indices)
+    _validate_index_range(original, index_range)
+
+    reshape_case = _classify_reshape_case(original.type(), vertex_indices)
+    (
+        vertex_indices,
+        index_range,
+        reshape_geometry,
+        moved_origin_index,
+    ) = _RESHAPE_CASE_HANDLERS[reshape_case](
+        vertex_indices, index_range, reshape_geometry
+    )
+
+    spliced = _splice_geometry(
+        original, vertex_indices, index_range, reshape_geometry, moved_origin_index
+    )
+    if spliced is not None:
+        return spliced
+    # fall back to editing vertex by vertex if the indices do not
+    # target a single linestring part or ring (e.g. multipoints),
+    # or if the ring collapses and is removed
+    return _splice_vertex_by_vertex(
+        original,
+        vertex_indices,
+        index_range[0],
+        reshape_geometry,
+        moved_origin_index,
+    )
+
+
+def _validate_index_range(original: QgsGeometry, index_range: tuple[int, int]) -> None:
+    """
+    Fails fast on vertex indices outside the geometry, before any geometry
+    is cloned or edited.
+    """
+
+    geometry = original.constGet()
+    vertex_count = geometry.nCoordinates() if geometry is not None else 0
+    min_index, max_index = index_range
+    if min_index < 0 or max_index >= vertex_count:
+        raise GeometryTransformationError(
+            f"vertex indices {min_index}-{max_index} out of range on {original}"
+        )
+
+
+def _collapse_vertex_by_vertex(
+    original: QgsGeometry,
+    vertex_indices: list[int],
+    reshape_geometry: QgsPoint,
 ) -> QgsGeometry:
     new = clone_geometry_safely(original)
 
-    if isinstance(reshape_geometry, QgsPoint):
-        # move the first replaced vertex
-        if not new.moveVertex(reshape_geometry, vertex_indices[0]):
+    # move the first replaced vertex
+    if not new.moveVertex(reshape_geometry, vertex_indices[0]):
+        raise GeometryTransformationError(
+            f"could not move vertex {vertex_indices[0]}"
+            f" on {new} to {reshape_geometry}"
+        )
+    # delete rest in reverse order
+    for deleted_index in sorted(vertex_indices[1:], reverse=True):
+        if not new.deleteVertex(deleted_index):
             raise GeometryTransformationError(
-                f"could not move vertex {vertex_indices[0]}"
-                f" on {new} to {reshape_geometry}"
+                f"could not delete vertex {deleted_index} on {new}"
             )
-        # delete rest in reverse order
-        for deleted_index in sorted(vertex_indices[1:], reverse=True):
-            if not new.deleteVertex(deleted_index):
-                raise GeometryTransformationError(
-                    f"could not delete vertex {deleted_index} on {new}"
-                )
 
-    else:
-        # since the indices are always the longest continuous segment on
-        # the origin geometry, if the indices wrap around also at the index
-        # list start/end, its known to be a closed geometry
-
-        # handle the case when a full polygon ring is reshaped
-        if (
-            original.type() == QgsWkbTypes.GeometryType.PolygonGeometry
-            and len(vertex_indices) > 1
-            and vertex_indices[0] == vertex_indices[-1]
-        ):
-            # can just omit the last vertex from target indices since it will
-            # either be a mid-ring index duplicated, or the polygon ring origin index
-            # (first/last, which will be automatically matched even without explicitly
-            # moving both indices)
-            vertex_indices = vertex_indices[:-1]
-
-            # support reshape both with a fully redrawn closed geometry, and even
-            # without explicitly closing the geometry, similary to target indices
-            # can just omit the last reshape geometry vertex if it was closed
-            if reshape_geometry.isClosed():
-                reshape_geometry = reshape_geometry.clone()
-                if not reshape_geometry.deleteVertex(
-                    QgsVertexId(0, 0, reshape_geometry.vertexCount(0, 0) - 1)
-                ):
-                    raise GeometryTransformationError(
-                        f"could not delete last vertex on {reshape_geometry}"
-                    )
-
-        # handle the case when a full closed linestring in reshaped
-        elif (
-            original.type() == QgsWkbTypes.GeometryType.LineGeometry
-            and len(vertex_indices) > 1
-            and vertex_indices[0] == vertex_indices[-1]
-        ):
-            # handle wraparound at origin by simply using the correct start index
-            # instead of duplicating the max vertex index at the first index
-            if vertex_indices[0] == max(vertex_indices):
-                vertex_indices[0] = min(vertex_indices) - 1
-
-            # handle wraparound at non-origin by simply rewriting the indices as if
-            # the origin was at the new reshape geometry origin. this will essentially
-            # scroll origin along the original geometryto the reshape start location,
-            # assume this is not an issue since there was nothing connected at the
-            # previous origin and something was connected at the new origin
-            else:
-                vertex_indices = list(
-                    range(min(vertex_indices) - 1, max(vertex_indices) + 1)
-                )
+    return new
+
+
+def _splice_vertex_by_vertex(
+    original: QgsGeometry,
+    vertex_indices: Sequence[int],
+    min_vertex_index: int,
+    reshape_geometry: QgsLineString,
+    moved_origin_index: Optional[int] = None,
+) -> QgsGeometry:
+    new = clone_geometry_safely(original)
+
+    if moved_origin_index is not None and not new.moveVertex(
+        reshape_geometry.startPoint(), moved_origin_index
+    ):
+        raise GeometryTransformationError(
+            f"could not move vertex {moved_origin_index}"
+            f" on {new} to {reshape_geometry.startPoint()}"
+        )
+
+    new_vertices = reshape_geometry.points()
 
-            # similarly to polygon rings support the reshape even without closing the
-            # reshape geometry, by closing the reshape geometry manually here
-            # NOTE: this way the code will never break closed linestring geometries,
-            # even if that is what is wanted. TODO: possibly change this logic to
-            # always require closed reshape geometries for closed origin geometries,
-            # so that its an error to reshape a polygon ring without closing it?
-            if not reshape_geometry.isClosed():
-                reshape_geometry = reshape_geometry.clone()
-                reshape_geometry.close()
-
-        # handle case when a closed linestring in partially reshaped in a way that
-        # the part origin wraparound falls inside the target vertex indices as
-        # indicated by a gap in the otherwise continuous vertex indices
-        elif (
-            original.type() == QgsWkbTypes.GeometryType.LineGeometry
-            and len(vertex_indices) > 1
-            and any(
-                abs(first - second) > 1
-                for first, second in zip(vertex_indices[:-1], vertex_indices[1:])
+    # add vertices before the first replaced vertex
+    for new_vertex_index, new_vertex in enumerate(new_vertices):
+        add_before_index = min_vertex_index + new_vertex_index
+        if not new.insertVertex(new_vertex, add_before_index):
+            raise GeometryTransformationError(
+                f"could not insert {new_vertex} vertex"
+                f" before {add_before_index} on {new}"
+            )
+
+    # delete replace vertices that were moved by the added count in reverse order
+    added_vertex_count = len(new_vertices)
+    for original_delete_index in sorted(vertex_indices, reverse=True):
+        deleted_index = original_delete_index + added_vertex_count
+        if not new.deleteVertex(deleted_index):
+            raise GeometryTransformationError(
+                f"could not delete vertex {deleted_index} on {new}"
             )
+
+    return new
+
+
+class _ReshapeCase(IntEnum):
+    SIMPLE_LINE = 0
+    CLOSED_POLYGON_RING = 1
+    CLOSED_LINE_FULL = 2
+    CLOSED_LINE_WRAPAROUND = 3
+
+
+_ReshapeTarget = tuple[Sequence[int], tuple[int, int], QgsLineString, Optional[int]]
+"""
+Vertex indices to replace, the smallest and largest vertex index touched
+by the reshape, the line to replace them with and optionally the vertex
+index to move to the start of the line.
+"""
+
+
+def _index_range(vertex_indices: list[int]) -> tuple[int, int]:
+    return min(vertex_indices), max(vertex_indices)
+
+
+def _classify_reshape_case(
+    geometry_type: QgsWkbTypes.GeometryType, vertex_indices: list[int]
+) -> _ReshapeCase:
+    if len(vertex_indices) < 2:  # noqa: PLR2004
+        return _ReshapeCase.SIMPLE_LINE
+
+    # since the indices are always the longest continuous segment on
+    # the origin geometry, if the indices wrap around also at the index
+    # list start/end, its known to be a closed geometry
+    if vertex_indices[0] == vertex_indices[-1]:
+        if geometry_type == QgsWkbTypes.GeometryType.PolygonGeometry:
+            return _ReshapeCase.CLOSED_POLYGON_RING
+        if geometry_type == QgsWkbTypes.GeometryType.LineGeometry:
+            return _ReshapeCase.CLOSED_LINE_FULL
+        return _ReshapeCase.SIMPLE_LINE
+
+    # a gap in the otherwise continuous vertex indices indicates that
+    # a closed linestring origin falls inside the indices
+    if geometry_type == QgsWkbTypes.GeometryType.LineGeometry and any(
+        abs(first - second) > 1
+        for first, second in zip(vertex_indices[:-1], vertex_indices[1:])
+    ):
+        return _ReshapeCase.CLOSED_LINE_WRAPAROUND
+
+    return _ReshapeCase.SIMPLE_LINE
+
+
+def _target_simple_line(
+    vertex_indices: Sequence[int],
+    index_range: tuple[int, int],
+    reshape_geometry: QgsLineString,
+) -> _ReshapeTarget:
+    return vertex_indices, index_range, reshape_geometry, None
+
+
+def _target_closed_polygon_ring(
+    vertex_indices: Sequence[int],
+    index_range: tuple[int, int],
+    reshape_geometry: QgsLineString,
+) -> _ReshapeTarget:
+    """
+    Handles the case when a full polygon ring is reshaped.
+    """
+
+    # can just omit the last vertex from target indices since it will
+    # either be a mid-ring index duplicated, or the polygon ring origin index
+    # (first/last, which will be automatically matched even without explicitly
+    # moving both indices)
+    vertex_indices = vertex_indices[:-1]
+
+    # support reshape both with a fully redrawn closed geometry, and even
+    # without explicitly closing the geometry, similary to target indices
+    # can just omit the last reshape geometry vertex if it was closed
+    if reshape_geometry.isClosed():
+        reshape_geometry = reshape_geometry.clone()
+        if not reshape_geometry.deleteVertex(
+            QgsVertexId(0, 0, reshape_geometry.vertexCount(0, 0) - 1)
         ):
-            # reshape will scroll the origin to be located at the start
-            # of the reshape segment, to match the ends at the new position make
-            # the wraparound vertex of the list the part minimum instead of the
-            # part maximum (to insert the reshape as the start of the part), and
-            # move the part maximum index to the start of the reshape to match
-            # the new origin
-            min_index, max_index = min(vertex_indices), max(vertex_indices)
-            vertex_indices = [
-                (min_index - 1 if i == max_index else i) for i in vertex_indices
-            ]
-            if not new.moveVertex(reshape_geometry.startPoint(), max_index):
-                raise GeometryTransformationError(
-                    f"could not move vertex {max_index}"
-                    f" on {new} to {reshape_geometry.startPoint()}"
-                )
+            raise GeometryTransformationError(
+                f"could not delete last vertex on {reshape_geometry}"
+            )
 
-        # add vertices before the first replaced vertex
-        min_vertex_index = min(vertex_indices)
-        for new_vertex_index, new_vertex in enumerate(reshape_geometry.vertices()):
-            add_before_index = min_vertex_index + new_vertex_index
-            if not new.insertVertex(new_vertex, add_before_index):
-                raise GeometryTransformationError(
-                    f"could not insert {new_vertex} vertex"
-                    f" before {add_before_index} on {new}"
-                )
+    return vertex_indices, index_range, reshape_geometry, None
 
-        # delete replace vertices that were moved by the added count in reverse order
-        added_vertex_count = reshape_geometry.vertexCount()
-        for original_delete_index in sorted(vertex_indices, reverse=True):
-            deleted_index = original_delete_index + added_vertex_count
-            if not new.deleteVertex(deleted_index):
-                raise GeometryTransformationError(
-                    f"could not delete vertex {deleted_index} on {new}"
-                )
 
-    return new
+def _target_closed_line_full(
+    vertex_indices: Sequence[int],
+    index_range: tuple[int, int],
+    reshape_geometry: QgsLineString,
+) -> _ReshapeTarget:
+    """
+    Handles the case when a full closed linestring is reshaped.
+    """
+
+    # handle wraparound at origin by simply using the correct start index
+    # instead of duplicating the max vertex index at the first index
+    min_index, max_index = index_range
+    if vertex_indices[0] == max_index:
+        vertex_indices = [min_index - 1, *vertex_indices[1:]]
+
+    # handle wraparound at non-origin by simply rewriting the indices as if
+    # the origin was at the new reshape geometry origin. this will essentially
+    # scroll origin along the original geometryto the reshape start location,
+    # assume this is not an issue since there was nothing connected at the
+    # previous origin and something was connected at the new origin
+    else:
+        vertex_indices = range(min_index - 1, max_index + 1)
+
+    # similarly to polygon rings support the reshape even without closing the
+    # reshape geometry, by closing the reshape geometry manually here
+    # NOTE: this way the code will never break closed linestring geometries,
+    # even if that is what is wanted. TODO: possibly change this logic to
+    # always require closed reshape geometries for closed origin geometries,
+    # so that its an error to reshape a polygon ring without closing it?
+    if not reshape_geometry.isClosed():
+        reshape_geometry = reshape_geometry.clone()
+        reshape_geometry.close()
+
+    return vertex_indices, (min_index - 1, max_index), reshape_geometry, None
+
+
+def _target_closed_line_wraparound(
+    vertex_indices: Sequence[int],
+    index_range: tuple[int, int],
+    reshape_geometry: QgsLineString,
+) -> _ReshapeTarget:
+    """
+    Handles the case when a closed linestring is partially reshaped in a way
+    that the part origin wraparound falls inside the target vertex indices.
+    """
 
+    # reshape will scroll the origin to be located at the start
+    # of the reshape segment, to match the ends at the new position make
+    # the wraparound vertex of the list the part minimum instead of the
+    # part maximum (to insert the reshape as the start of the part), and
+    # move the part maximum index to the start of the reshape to match
+    # the new origin
+    min_index, max_index = index_range
+    vertex_indices = [(min_index - 1 if i == max_index else i) for i in vertex_indices]
+    return vertex_indices, (min_index - 1, max_index), reshape_geometry, max_index
+
+
+_RESHAPE_CASE_HANDLERS: dict[
+    _ReshapeCase,
+    Callable[[Sequence[int], tuple[int, int], QgsLineString], _ReshapeTarget],
+] = {
+    _ReshapeCase.SIMPLE_LINE: _target_simple_line,
+    _ReshapeCase.CLOSED_POLYGON_RING: _target_closed_polygon_ring,
+    _ReshapeCase.CLOSED_LINE_FULL: _target_closed_line_full,
+    _ReshapeCase.CLOSED_LINE_WRAPAROUND: _target_closed_line_wraparound,
+}
+
+
+def _splice_geometry(
+    original: QgsGeometry,
+    vertex_indices: Sequence[int],
+    index_range: tuple[int, int],
+    reshape_geometry: QgsLineString,
+    moved_origin_index: Optional[int] = None,
+) -> Optional[QgsGeometry]:
+    """
+    Replaces the vertices at `vertex_indices` with the `reshape_geometry`
+    vertices by rebuilding the linestring part or ring containing the indices
+    once, instead of inserting and deleting the vertices one by one.
 
-def _move_edges(
-    edges: list[ReshapeEdge], new_start: QgsPoint, new_end: QgsPoint
-) -> None:
-    # hold on to the updates so next iteration for same feature
-    # uses the previous updated geometry instead of initial geometry
-    previously_updated_geoms: dict[tuple[str, int], QgsGeometry] = {}
+    Returns None if the indices do not all fall on a single linestring part
+    or ring of the original geometry, or if the ring would collapse.
+    """
 
-    for edge in edges:
-        new_geometry = _move_vertex(
-            previously_updated_geoms.get(
-                (edge.layer.id(), edge.feature.id()), edge.feature.geometry()
-            ),
-            edge.vertex_index,
-            new_start if edge.is_start else new_end,
+    ring_of_vertices = _find_ring_of_vertices(
+        original,
+        (
+            vertex_indices
+            if moved_origin_index is None
+            else [*vertex_indices, moved_origin_index]
+        ),
+        index_range,
+    )
+    if ring_of_vertices is None:
+        return None
+    vertex_id, ring_offset, ring = ring_of_vertices
+
+    # take the moved origin from the line before its dimensions are matched,
+    # so that the vertex keeps its own z and m if the line does not have them
+    reshape_start = reshape_geometry.startPoint()
+    reshape_geometry = _as_matching_dimensions(reshape_geometry, ring)
+    ring_vertex_indices = (
+        vertex_indices
+        if ring_offset == 0
+        else [index - ring_offset for index in vertex_indices]
+    )
+    ring_min_index = index_range[0] - ring_offset
+    is_polygon_ring = original.type() == QgsWkbTypes.GeometryType.PolygonGeometry
+
+    points = ring.points()
+    if moved_origin_index is not None:
+        points[moved_origin_index - ring_offset] = _moved_point(
+            points[moved_origin_index - ring_offset],
+            reshape_start,
         )
-        # _move_vertex returns None if verticis
-        # position was not changed
-        if new_geometry is not None:
-            _set_editable_and_begin_edit_command_once(edge.layer)
-
-            _update_geometry_to_layer_feature(
-                edge.layer,
-                edge.feature,
-                new_geometry,
-            )
-            previously_updated_geoms[
-                (edge.layer.id(), edge.feature.id())
-            ] = new_geometry
+    new_ring = QgsLineString(
+        _splice_ring(
+            points,
+            ring_vertex_indices,
+            ring_min_index,
+            reshape_geometry.points(),
+            is_polygon_ring,
+        )
+    )
 
+    return _with_replaced_ring(original, vertex_id, new_ring)
 
-def _move_vertex(
-    original: QgsGeometry, vertex_index: int, new_position: QgsPoint
+
+def _collapse_geometry(
+    original: QgsGeometry,
+    vertex_indices: list[int],
+    index_range: tuple[int, int],
+    reshape_geometry: QgsPoint,
 ) -> Optional[QgsGeometry]:
-    original_position = original.vertexAt(vertex_index)
-    if (
-        original_position.x() == new_position.x()
-        and original_position.y() == new_position.y()
+    """
+    Moves the first vertex of `vertex_indices` to `reshape_geometry` and
+    removes the rest by rebuilding the linestring part or ring containing the
+    indices once, instead of deleting the vertices one by one.
+
+    Returns None if the indices do not all fall on a single linestring part
+    or ring of the original geometry, or if the ring would collapse.
+    """
+
+    ring_of_vertices = _find_ring_of_vertices(original, vertex_indices, index_range)
+    if ring_of_vertices is None:
+        return None
+    vertex_id, ring_offset, ring = ring_of_vertices
+
+    ring_vertex_indices = (
+        vertex_indices
+        if ring_offset == 0
+        else [index - ring_offset for index in vertex_indices]
+    )
+    moved_index = ring_vertex_indices[0]
+    is_polygon_ring = original.type() == QgsWkbTypes.GeometryType.PolygonGeometry
+
+    points = ring.points()
+    new_ring = QgsLineString(
+        _collapse_ring(
+            points,
+            ring_vertex_indices,
+            _moved_point(points[moved_index], reshape_geometry),
+            is_polygon_ring,
+        )
+    )
+
+    return _with_replaced_ring(original, vertex_id, new_ring)
+
+
+def _find_ring_of_vertices(
+    original: QgsGeometry, vertex_indices: Sequence[int], index_range: tuple[int, int]
+) -> Optional[tuple[QgsVertexId, int, QgsLineString]]:
+    """
+    Returns the vertex id of the smallest vertex index, the vertex index offset
+    of the ring and the linestring part or ring itself, if all the vertex indices
+    fall on a single linestring part or ring of the geometry.
+    """
+
+    # a range never has duplicates
+    unique_count = (
+        len(vertex_indices)
+        if isinstance(vertex_indices, range)
+        else len(set(vertex_indices))
+    )
+    if unique_count != len(vertex_indices):
+        return None
+
+    min_index, max_index = index_range
+    geometry = original.constGet()
+
+    # single linestrings are the most common case, the vertex indices are
+    # the linestring point indices as is so no lookup is needed
+    if isinstance(geometry, QgsLineString):
+        if min_index < 0 or max_index >= geometry.numPoints():
+            return None
+        return QgsVertexId(0, 0, min_index), 0, geometry
+
+    found, vertex_id = original.vertexIdFromVertexNr(min_index)
+    ring = _get_ring(geometry, vertex_id) if found else None
+    if not isinstance(ring, QgsLineString):
+        return None
+
+    ring_offset = min_index - vertex_id.vertex
+    if max_index - ring_offset >= ring.numPoints():
+        return None
+
+    return vertex_id, ring_offset, ring
+
+
+def _with_replaced_ring(
+    original: QgsGeometry, vertex_id: QgsVertexId, new_ring: QgsLineString
+) -> Optional[QgsGeometry]:
+    """
+    Returns a copy of the geometry with the ring replaced, or None if the
+    ring collapses, in which case editing vertex by vertex removes the ring
+    or part the same way as QGIS does when deleting its vertices.
+    """
+
+    if new_ring.numPoints() < (
+        4 if original.type() == QgsWkbTypes.GeometryType.PolygonGeometry else 2
     ):
         return None
 
-    new = clone_geometry_safely(original)
-    if not new.moveVertex(new_position, vertex_index):
+    return QgsGeometry(_replace_ring(original.constGet(), vertex_id, new_ring))
+
+
+def _splice_ring(
+    points: list[QgsPoint],
+    vertex_indices: Sequence[int],
+    min_index: int,
+    new_points: list[QgsPoint],
+    is_polygon_ring: bool,
+) -> list[QgsPoint]:
+    """
+    Builds the points of a ring where the points at `vertex_indices` are removed
+    and `new_points` are inserted at the position of the first removed point.
+
+    For polygon rings the first and last vertices are kept in sync the same
+    way as when editing the ring vertex by vertex through `QgsGeometry`.
+    """
+
+    # a continuous range of indices needs no set for the membership checks
+    replaced_indices = (
+        vertex_indices if isinstance(vertex_indices, range) else set(vertex_indices)
+    )
+
+    if isinstance(vertex_indices, range) or (
+        max(replaced_indices) - min_index + 1 == len(replaced_indices)
+    ):
+        # continuous indices are the common case, copy the tail as a single slice
+        tail = points[min_index + len(replaced_indices) :]
+    else:
+        tail = [
+            point
+            for index, point in enumerate(points[min_index:], min_index)
+            if index not in replaced_indices
+        ]
+    spliced_points = points[:min_index] + new_points + tail
+
+    if is_polygon_ring:
+        if len(points) - 1 in replaced_indices:
+            spliced_points[0] = spliced_points[-1]
+        elif min_index == 0:
+            spliced_points[-1] = spliced_points[0]
+
+    return spliced_points
+
+
+def _collapse_ring(
+    points: list[QgsPoint],
+    vertex_indices: list[int],
+    moved_point: QgsPoint,
+    is_polygon_ring: bool,
+) -> list[QgsPoint]:
+    """
+    Builds the points of a ring where the point at the first of `vertex_indices`
+    is replaced by `moved_point` and the points at rest of the indices are removed.
+
+    For polygon rings the first and last vertices are kept in sync the same
+    way as when editing the ring vertex by vertex through `QgsGeometry`.
+    """
+
+    moved_index = vertex_indices[0]
+    last_index = len(points) - 1
+    deleted_indices = set(vertex_indices[1:])
+
+    points = list(points)
+    points[moved_index] = moved_point
+    if is_polygon_ring:
+        if moved_index == 0:
+            points[last_index] = points[moved_index]
+        elif moved_index == last_index:
+            points[0] = points[moved_index]
+
+    collapsed_points = [
+        point for index, point in enumerate(points) if index not in deleted_indices
+    ]
+
+    if is_polygon_ring:
+        if 0 in deleted_indices:
+            collapsed_points[-1] = collapsed_points[0]
+        elif last_index in deleted_indices:
+            collapsed_points[0] = collapsed_points[-1]
+
+    return collapsed_points
+
+
+def _moved_point(original_position: QgsPoint, new_position: QgsPoint) -> QgsPoint:
+    """
+    Returns a copy of the original vertex at the new position, keeping the
+    original z and m values if the new position does not have them, similarly
+    as moving the vertex in place would.
+    """
+
+    moved = QgsPoint(original_position)
+    moved.setX(new_position.x())
+    moved.setY(new_position.y())
+    if moved.is3D() and new_position.is3D():
+        moved.setZ(new_position.z())
+    if moved.isMeasure() and new_position.isMeasure():
+        moved.setM(new_position.m())
+    return moved
+
+
+def _get_ring(
+    geometry: QgsAbstractGeometry, vertex_id: QgsVertexId
+) -> Optional[QgsAbstractGeometry]:
+    if isinstance(geometry, QgsGeometryCollection):
+        geometry = geometry.geometryN(vertex_id.part)
+
+    if isinstance(geometry, QgsCurvePolygon):
+        if vertex_id.ring == 0:
+            return geometry.exteriorRing()
+        return geometry.interiorRing(vertex_id.ring - 1)
+
+    return geometry
+
+
+def _replace_ring(
+    geometry: QgsAbstractGeometry, vertex_id: QgsVertexId, ring: QgsLineString
+) -> QgsAbstractGeometry:
+    """
+    Builds a copy of the geometry with the ring at `vertex_id` replaced,
+    cloning only the parts and rings that are kept as is.
+    """
+
+    if isinstance(geometry, QgsGeometryCollection):
+        new_collection = geometry.createEmptyWithSameType()
+        for part_index in range(geometry.numGeometries()):
+            part = geometry.geometryN(part_index)
+            new_collection.addGeometry(
+                _replace_ring(part, vertex_id, ring)
+                if part_index == vertex_id.part
+                else part.clone()
+            )
+        return new_collection
+
+    if isinstance(geometry, QgsCurvePolygon):
+        new_polygon = geometry.createEmptyWithSameType()
+        new_polygon.setExteriorRing(
+            ring if vertex_id.ring == 0 else geometry.exteriorRing().clone()
+        )
+        new_polygon.setInteriorRings(
+            [
+                (
+                    ring
+                    if ring_index == vertex_id.ring - 1
+                    else geometry.interiorRing(ring_index).clone()
+                )
+                for ring_index in range(geometry.numInteriorRings())
+            ]
+        )
+        return new_polygon
+
+    return ring
+
+
+def _as_matching_dimensions(
+    line: QgsLineString, target: QgsAbstractGeometry
+) -> QgsLineString:
+    """
+    Returns the line with z and m values added or dropped to match the target,
+    similarly as inserted vertices would be handled by the target geometry.
+    """
+
+    if line.is3D() == target.is3D() and line.isMeasure() == target.isMeasure():
+        return line
+
+    line = line.clone()
+    if target.is3D() and not line.is3D():
+        line.addZValue(math.nan)
+    elif not target.is3D():
+        line.dropZValue()
+    if target.isMeasure() and not line.isMeasure():
+        line.addMValue(math.nan)
+    elif not target.isMeasure():
+        line.dropMValue()
+    return line
+
+
+def _move_edges(
+    edges: list[ReshapeEdge],
+    new_start: QgsPoint,
+    new_end: QgsPoint,
+    session: _EditSession,
+) -> None:
+    # resolve each layer id only once, most edges are on the same layers
+    layer_ids: dict[int, str] = {}
+
+    # group the edges by feature, so that all the vertices of a feature
+    # are moved on a single copy of its geometry which is updated only once,
+    # and by vertex so that each vertex is moved only once
+    edges_by_feature: dict[
+        tuple[str, int], tuple[QgsVectorLayer, QgsFeature, dict[int, QgsPoint]]
+    ] = {}
+    # new position indexed by the is_start flag of the edge
+    new_position_by_is_start = (new_end, new_start)
+    for edge in edges:
+        layer_id = layer_ids.get(id(edge.layer))
+        if layer_id is None:
+            layer_id = layer_ids[id(edge.layer)] = edge.layer.id()
+        key = (layer_id, edge.feature.id())
+        feature_edges = edges_by_feature.get(key)
+        if feature_edges is None:
+            feature_edges = edges_by_feature[key] = (edge.layer, edge.feature, {})
+        # later edge for the same vertex wins, as when moved one by one
+        feature_edges[2][edge.vertex_index] = new_position_by_is_start[edge.is_start]
+
+    for (layer_id, _), (layer, feature, new_positions) in edges_by_feature.items():
+        original_geometry = feature.geometry()
+
+        # clone and edit the layer only if some vertex position is changed
+        if all(
+            _is_vertex_at(original_geometry, vertex_index, new_position)
+            for vertex_index, new_position in new_positions.items()
+        ):
+            continue
+
+        new_geometry = clone_geometry_safely(original_geometry)
+        for vertex_index, new_position in new_positions.items():
+            _apply_move_vertex(new_geometry, vertex_index, new_position)
+
+        _set_editable_and_begin_edit_command_once(layer, session, layer_id)
+
+        _update_geometry_to_layer_feature(
+            layer,
+            layer_id,
+            feature,
+            new_geometry,
+            session,
+        )
+
+
+def _is_vertex_at(geometry: QgsGeometry, vertex_index: int, position: QgsPoint) -> bool:
+    vertex = geometry.vertexAt(vertex_index)
+    return vertex.x() == position.x() and vertex.y() == position.y()
+
+
+def _apply_move_vertex(
+    working_geometry: QgsGeometry, vertex_index: int, new_position: QgsPoint
+) -> None:
+    """
+    Moves the vertex of the working geometry in place,
+    unless the vertex is already at the new position.
+    """
+
+    if _is_vertex_at(working_geometry, vertex_index, new_position):
+        return
+
+    if not working_geometry.moveVertex(new_position, vertex_index):
         raise GeometryTransformationError(
-            f"could not move vertex {vertex_index} on {new} to {new_position}"
+            f"could not move vertex {vertex_index}"
+            f" on {working_geometry} to {new_position}"
         )
-    return new
 
 
 def _update_geometry_to_layer_feature(
     layer: QgsVectorLayer,
+    layer_id: str,
     feature: QgsFeature,
     new_geometry: QgsGeometry,
+    session: _EditSession,
 ) -> None:
-    if not layer.changeGeometry(
-        feature.id(),
-        new_geometry,
-    ):
-        raise GeometryTransformationError(
-            f"could not update geometry {new_geometry} to fid {feature.id()} on {layer}"
-        )
+    """
+    Collects the geometry change to be applied to the layer when all
+    the edits are done, a later change to the same feature replaces
+    the earlier one.
+    """
+
+    pending_updates = session.pending_geometry_updates
+    if layer_id not in pending_updates:
+        pending_updates[layer_id] = (layer, {})
+    pending_updates[layer_id][1][feature.id()] = new_geometry
+
+
+def _change_geometries(
+    layer: QgsVectorLayer, new_geometries: dict[int, QgsGeometry]
+) -> None:
+    for feature_id, new_geometry in new_geometries.items():
+        if not layer.changeGeometry(feature_id, new_geometry):
+            raise GeometryTransformationError(
+                f"could not update geometry {new_geometry}"
+                f" to fid {feature_id} on {layer}"
+            )
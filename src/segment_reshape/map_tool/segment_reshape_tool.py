@@ -18,7 +18,7 @@
 #  along with segment-reshape-qgis-plugin. If not, see <https://www.gnu.org/licenses/>.
 
 import logging
-from collections.abc import Generator, Iterator
+from collections.abc import Generator
 from contextlib import contextmanager
 from enum import Enum, IntEnum
 from typing import (
@@ -31,6 +31,7 @@ from typing import (
 
 from qgis.core import (
     QgsApplication,
+    QgsFeature,
     QgsGeometry,
     QgsLineString,
     QgsPoint,
@@ -48,6 +49,7 @@ from qgis.gui import (
     QgsMapToolIdentify,
     QgsRubberBand,
 )
+from qgis.PyQt import sip
 from qgis.PyQt.QtCore import Qt
 from qgis.PyQt.QtGui import QColor, QKeyEvent
 from qgis.PyQt.QtWidgets import QApplication
@@ -72,18 +74,49 @@ class CoordinateTransformationError(Exception):
     ...
 
 
-@contextmanager
+_shared_identify_tool: Optional[QgsMapToolIdentify] = None
+
+
 def _optional_identify_tool(
     tool: Optional[QgsMapToolIdentify] = None,
-) -> Iterator[QgsMapToolIdentify]:
+) -> QgsMapToolIdentify:
+    """
+    Returns the given tool, or the shared identify tool
+    for the main map canvas.
+    """
+
     if tool:
-        yield tool
-    else:
-        tool = QgsMapToolIdentify(iface.mapCanvas())
-        try:
-            yield tool
-        finally:
-            tool.deleteLater()
+        return tool
+    return _shared_identify_tool_for(iface.mapCanvas())
+
+
+def _shared_identify_tool_for(canvas: QgsMapCanvas) -> QgsMapToolIdentify:
+    """
+    Returns an identify tool for the canvas, lazily created and shared
+    by all the lookups and tool instances on the same canvas.
+    """
+
+    global _shared_identify_tool  # noqa: PLW0603
+
+    if (
+        _shared_identify_tool is None
+        or sip.isdeleted(_shared_identify_tool)
+        or _shared_identify_tool.canvas() is not canvas
+    ):
+        _shared_identify_tool = QgsMapToolIdentify(canvas)
+    return _shared_identify_tool
+
+
+def clear_shared_identify_tool() -> None:
+    """
+    Releases the shared identify tool, to be called when the plugin is unloaded.
+    """
+
+    global _shared_identify_tool  # noqa: PLW0603
+
+    if _shared_identify_tool is not None and not sip.isdeleted(_shared_identify_tool):
+        _shared_identify_tool.deleteLater()
+    _shared_identify_tool = None
 
 
 @contextmanager
@@ -98,6 +131,22 @@ def override_cursor(cursor: Qt.CursorShape) -> Generator[None, None, None]:
 COLOR_BLUE = QColor(10, 20, 150)
 COLOR_GREY = QColor(211, 211, 211)
 
+LOCATION_KEY_DECIMALS = 6
+MAX_CACHED_LOCATIONS = 4
+
+_SegmentKey = tuple[str, int, tuple[int, int]]
+"""
+Layer id, feature id and the vertex indices of the segment closest to a location.
+"""
+
+_LocationKey = tuple[str, float, float]
+"""
+Active layer id and the rounded map coordinates of a picked location.
+"""
+
+# shared by every tool between picks, the lists are never mutated
+_EMPTY_RESULTS = find_related.CommonGeometriesResult(None, [], [])
+
 
 class ToolMode(Enum):
     PICK_SEGMENT = "pick_segment"
@@ -137,10 +186,25 @@ class SegmentReshapeTool(QgsMapToolCapture):
         self.start_point_indicator_rubber_band = QgsRubberBand(canvas)
         self.start_point_indicator_rubber_band.setStrokeColor(COLOR_GREY)
         self.start_point_indicator_rubber_band.setLineStyle(Qt.PenStyle.DotLine)
-
-        self.find_segment_results = find_related.CommonGeometriesResult(None, [], [])
-
-        self._identify_tool = QgsMapToolIdentify(canvas)
+        self._start_point_indicator_end: Optional[QgsPointXY] = None
+        self._last_digitized_point: Optional[QgsPointXY] = None
+
+        self.find_segment_results = _EMPTY_RESULTS
+
+        # the results of the latest search, reused by a pick at the same segment
+        self._cached_results: Optional[
+            tuple[_SegmentKey, find_related.CommonGeometriesResult]
+        ] = None
+        # layers by id whose changes already clear the cached results
+        self._layers_with_invalidation: dict[str, QgsVectorLayer] = {}
+        # the identified segment by active layer and picked map location,
+        # so that repeated picks at the same location skip the identify
+        self._segments_at_locations: dict[
+            _LocationKey,
+            Optional[tuple[QgsVectorLayer, QgsFeature, tuple[int, int]]],
+        ] = {}
+        # a repaint may follow changes to layers not involved in the results
+        canvas.mapCanvasRefreshed.connect(self._clear_cached_results)
 
     def activate(self) -> None:
         self._change_to_pick_location_mode()
@@ -149,6 +213,7 @@ class SegmentReshapeTool(QgsMapToolCapture):
     def deactivate(self) -> None:
         self.old_segment_rubber_band.hide()
         self.start_point_indicator_rubber_band.hide()
+        self._clear_cached_results()
 
         return super().deactivate()
 
@@ -161,7 +226,35 @@ class SegmentReshapeTool(QgsMapToolCapture):
         self.old_segment_rubber_band.reset()
         self.start_point_indicator_rubber_band.reset()
 
-        self.find_segment_results = find_related.CommonGeometriesResult(None, [], [])
+        self.find_segment_results = _EMPTY_RESULTS
+
+    def _clear_cached_results(self, *_: object) -> None:
+        self._cached_results = None
+        self._segments_at_locations.clear()
+
+    def _clear_cached_results_on_changes_to(self, layer: QgsVectorLayer) -> None:
+        """
+        Connects the feature, editing and undo signals of the layer to clear
+        the cached results, so that no results are reused after an edit.
+        """
+
+        layer_id = layer.id()
+        # a reloaded project may have a new layer with the same id
+        if self._layers_with_invalidation.get(layer_id) is layer:
+            return
+
+        for signal in (
+            layer.featureAdded,
+            layer.featureDeleted,
+            layer.geometryChanged,
+            layer.editingStopped,
+            layer.afterRollBack,
+            layer.dataChanged,
+            layer.undoStack().indexChanged,
+        ):
+            signal.connect(self._clear_cached_results)
+        layer.willBeDeleted.connect(self._clear_cached_results)
+        self._layers_with_invalidation[layer_id] = layer
 
     def _change_to_reshape_mode_for_geom(
         self, old_geom: QgsGeometry, layer: Optional[QgsVectorLayer] = None
@@ -182,11 +275,15 @@ class SegmentReshapeTool(QgsMapToolCapture):
         self.start_point_indicator_rubber_band.show()
         start_point = self.old_segment_rubber_band.getPoint(0, 0)
         self.start_point_indicator_rubber_band.addPoint(start_point, True)
+        self._start_point_indicator_end = None
+        self._last_digitized_point = None
 
     def keyPressEvent(self, key_event: QKeyEvent) -> None:  # noqa: N802
         point_count = self.size()
         super().keyPressEvent(key_event)  # handle normal undo and cancel procedures
-        if self._tool_mode == ToolMode.RESHAPE:
+        if self._tool_mode is ToolMode.RESHAPE:
+            # the last point may have been undone
+            self._last_digitized_point = None
             if key_event.key() == Qt.Key_Escape:
                 self._change_to_pick_location_mode()
             elif (
@@ -217,7 +314,7 @@ class SegmentReshapeTool(QgsMapToolCapture):
 
     @log_if_fails
     def canvasReleaseEvent(self, mouse_event: QgsMapMouseEvent) -> None:  # noqa: N802
-        if self._tool_mode == ToolMode.PICK_SEGMENT:
+        if self._tool_mode is ToolMode.PICK_SEGMENT:
             if mouse_event.button() == Qt.LeftButton:
                 self._handle_pick_segment_left_click(mouse_event.mapPoint())
             return
@@ -236,23 +333,34 @@ class SegmentReshapeTool(QgsMapToolCapture):
             mouse_event (QgsMapMouseEvent): Mouse events prepared by the cad system
         """
 
-        if self._tool_mode == ToolMode.RESHAPE:
+        if self._tool_mode is ToolMode.RESHAPE:
             if mouse_event.button() == Qt.LeftButton:
-                result = self.addVertex(
-                    mouse_event.mapPoint(), mouse_event.mapPointMatch()
-                )
+                map_point = mouse_event.mapPoint()
+                # a repeated click would only add a zero length segment
+                if self._last_digitized_point is not None and (
+                    self._last_digitized_point.compare(map_point)
+                ):
+                    return
+                result = self.addVertex(map_point, mouse_event.mapPointMatch())
                 if result == AddVertexReturn.TransformationError:
                     MsgBar.warning(
                         tr("Cannot transform the point to the layers coordinate system")
                     )
                     return
+                self._last_digitized_point = QgsPointXY(map_point)
                 self.startCapturing()
             elif mouse_event.button() == Qt.RightButton:
                 self._handle_reshape_right_click()
 
     def cadCanvasMoveEvent(self, mouse_event: QgsMapMouseEvent) -> None:  # noqa: N802
-        if self._tool_mode == ToolMode.RESHAPE and self.size() == 0:
-            self.start_point_indicator_rubber_band.movePoint(mouse_event.mapPoint())
+        if self._tool_mode is ToolMode.RESHAPE and self.size() == 0:
+            map_point = mouse_event.mapPoint()
+            # avoid repainting the indicator if the cursor map position is unchanged
+            if self._start_point_indicator_end is None or not (
+                self._start_point_indicator_end.compare(map_point)
+            ):
+                self.start_point_indicator_rubber_band.movePoint(map_point)
+                self._start_point_indicator_end = QgsPointXY(map_point)
         return super().cadCanvasMoveEvent(mouse_event)
 
     def _handle_pick_segment_left_click(self, location: QgsPointXY) -> None:
@@ -276,7 +384,10 @@ class SegmentReshapeTool(QgsMapToolCapture):
                 tr("Common segment found, changing to reshape mode"),
                 success=True,
             )
-            self._change_to_reshape_mode_for_geom(QgsGeometry(common_segment), layer)
+            # the geometry takes ownership, the cached results keep the segment
+            self._change_to_reshape_mode_for_geom(
+                QgsGeometry(common_segment.clone()), layer
+            )
 
     def _handle_reshape_right_click(self) -> None:
         with override_cursor(Qt.WaitCursor):
@@ -292,28 +403,31 @@ class SegmentReshapeTool(QgsMapToolCapture):
             if new_geometry.numPoints() == 1:
                 reshape_geom = new_geometry.pointN(0)
 
-            reshape.make_reshape_edits(
-                self.find_segment_results.common_parts,
-                self.find_segment_results.edges,
-                reshape_geom,
-            )
+            common_parts = self.find_segment_results.common_parts
+            edges = self.find_segment_results.edges
+            reshape.make_reshape_edits(common_parts, edges, reshape_geom)
 
+            self._clear_cached_results()
             self._change_to_pick_location_mode()
-            self.canvas().refresh()
+            # repaint only the edited layers, others are drawn from the cache
+            edited_layers = {
+                part.layer.id(): part.layer for part in [*common_parts, *edges]
+            }
+            for edited_layer in edited_layers.values():
+                edited_layer.triggerRepaint()
 
     def _find_common_segment(
         self, location: QgsPointXY
     ) -> tuple[Optional[QgsLineString], Optional[QgsVectorLayer]]:
-        LOGGER.info("Calculating common segment")
+        if LOGGER.isEnabledFor(logging.INFO):
+            LOGGER.info("Calculating common segment")
 
         active_layer = iface.activeLayer()
         if active_layer is None:
             MsgBar.warning(tr("No active layer found"), tr("Activate a layer first"))
             return None, None
 
-        results = SegmentReshapeTool.find_common_segment_at_location(
-            location, self._identify_tool
-        )
+        results = self._find_common_segment_results(location)
 
         if results is None:
             MsgBar.warning(
@@ -325,18 +439,75 @@ class SegmentReshapeTool(QgsMapToolCapture):
 
         return self.find_segment_results.segment, active_layer
 
+    def _find_common_segment_results(
+        self, location: QgsPointXY
+    ) -> Optional[find_related.CommonGeometriesResult]:
+        """
+        Finds the common segment at location, reusing the latest results
+        if the location is at the same segment and the identified segment
+        if the location was already picked.
+        """
+
+        active_layer = iface.activeLayer()
+        location_key = (
+            active_layer.id(),
+            round(location.x(), LOCATION_KEY_DECIMALS),
+            round(location.y(), LOCATION_KEY_DECIMALS),
+        )
+        if location_key in self._segments_at_locations:
+            segment = self._segments_at_locations[location_key]
+        else:
+            segment = SegmentReshapeTool._find_segment_at_location(
+                location, _shared_identify_tool_for(self.canvas())
+            )
+            if len(self._segments_at_locations) >= MAX_CACHED_LOCATIONS:
+                # forget the oldest location, only the latest picks are
+                # likely to be picked again at the same location
+                del self._segments_at_locations[next(iter(self._segments_at_locations))]
+            self._segments_at_locations[location_key] = segment
+            if isinstance(active_layer, QgsVectorLayer):
+                # a feature added or moved to the location changes the result
+                self._clear_cached_results_on_changes_to(active_layer)
+        if segment is None:
+            return None
+        layer, feature, vertex_indices = segment
+
+        key = (layer.id(), feature.id(), vertex_indices)
+        if self._cached_results is not None and self._cached_results[0] == key:
+            return self._cached_results[1]
+
+        results = find_related.find_segment_to_reshape(layer, feature, vertex_indices)
+        for part in [*results.common_parts, *results.edges]:
+            self._clear_cached_results_on_changes_to(part.layer)
+        self._cached_results = (key, results)
+        return results
+
     @staticmethod
     def find_common_segment_at_location(
         location: QgsPointXY, identify_tool: Optional[QgsMapToolIdentify] = None
     ) -> Optional[find_related.CommonGeometriesResult]:
-        with _optional_identify_tool(identify_tool) as tool:
-            identify_results = tool.identify(
-                geometry=QgsGeometry.fromPointXY(location),
-                mode=QgsMapToolIdentify.IdentifyMode.ActiveLayer,
-                layerType=QgsMapToolIdentify.Type.VectorLayer,
-            )
+        segment = SegmentReshapeTool._find_segment_at_location(location, identify_tool)
+        if segment is None:
+            return None
 
-        if len(identify_results) < 1:
+        return find_related.find_segment_to_reshape(*segment)
+
+    @staticmethod
+    def _find_segment_at_location(
+        location: QgsPointXY, identify_tool: Optional[QgsMapToolIdentify] = None
+    ) -> Optional[tuple[QgsVectorLayer, QgsFeature, tuple[int, int]]]:
+        """
+        Returns the active layer feature at location and the vertex
+        indices of its segment closest to the location.
+        """
+
+        identify_results = _optional_identify_tool(identify_tool).identify(
+            geometry=QgsGeometry.fromPointXY(location),
+            mode=QgsMapToolIdentify.IdentifyMode.ActiveLayer,
+            layerType=QgsMapToolIdentify.Type.VectorLayer,
+        )
+
+        if not identify_results:
             return None
 
         identify_result = identify_results[0]
@@ -351,6 +522,4 @@ class SegmentReshapeTool(QgsMapToolCapture):
             _,
         ) = feature.geometry().closestSegmentWithContext(location)
 
-        return find_related.find_segment_to_reshape(
-            layer, feature, (next_vertex_index - 1, next_vertex_index)
-        )
+        return layer, feature, (next_vertex_index - 1, next_vertex_index)
@@ -17,27 +17,54 @@
 #  You should have received a copy of the GNU General Public License
 #  along with segment-reshape-qgis-plugin. If not, see <https://www.gnu.org/licenses/>.
 
-from collections.abc import Iterable, Iterator
+import functools
+import itertools
+from collections.abc import Callable, Iterable, Iterator
 from typing import NamedTuple, Optional
 
 from qgis.core import (
     QgsAbstractGeometry,
+    QgsCurvePolygon,
     QgsFeature,
     QgsFeatureRequest,
+    QgsFeatureSource,
     QgsGeometry,
+    QgsGeometryCollection,
     QgsLineString,
     QgsPoint,
+    QgsPointXY,
     QgsPolygon,
     QgsProject,
+    QgsRectangle,
+    QgsSpatialIndex,
     QgsVectorLayer,
     QgsWkbTypes,
 )
+from qgis.PyQt import sip
+from qgis.PyQt.QtCore import pyqtBoundSignal
 
 from segment_reshape.geometry.reshape import ReshapeCommonPart, ReshapeEdge
-from segment_reshape.utils.geometry_utils import vertices
 
 Point = tuple[float, float]
-Segment = frozenset[Point]
+Segment = tuple[Point, Point]
+"""
+Segment end points in ascending order, so that equal segments
+compare equal regardless of their direction.
+"""
+
+# for now lines and polygons are supported as the trigger
+_TRIGGER_GEOMETRY_TYPES = (
+    QgsWkbTypes.GeometryType.LineGeometry,
+    QgsWkbTypes.GeometryType.PolygonGeometry,
+)
+
+
+class _EdgeCandidate(NamedTuple):
+    layer: QgsVectorLayer
+    feature: QgsFeature
+    component: QgsGeometry
+    component_vertices: set[Point]
+    feature_vertices: list[Point]
 
 
 class CommonGeometriesResult(NamedTuple):
@@ -67,69 +94,213 @@ def find_segment_to_reshape(
     )
 
 
+_project_vector_layers: Optional[list[QgsVectorLayer]] = None
+_project_with_invalidation: Optional[QgsProject] = None
+
+
+def _clear_project_vector_layers() -> None:
+    global _project_vector_layers  # noqa: PLW0603
+    _project_vector_layers = None
+
+
+def clear_project_vector_layers_cache() -> None:
+    """
+    Drops the cached project vector layers and disconnects from the project.
+    """
+
+    global _project_with_invalidation  # noqa: PLW0603
+
+    project = _project_with_invalidation
+    if project is not None and not sip.isdeleted(project):
+        project.layersAdded.disconnect(_clear_project_vector_layers)
+        project.layersRemoved.disconnect(_clear_project_vector_layers)
+        project.cleared.disconnect(_clear_project_vector_layers)
+    _project_with_invalidation = None
+    _clear_project_vector_layers()
+
+
+def _get_project_vector_layers(project: QgsProject) -> list[QgsVectorLayer]:
+    """
+    Returns the vector layers with geometries of the project, collected once
+    and recollected only after the project layers have changed.
+    """
+
+    global _project_vector_layers, _project_with_invalidation  # noqa: PLW0603
+
+    if _project_with_invalidation is not project:
+        project.layersAdded.connect(_clear_project_vector_layers)
+        project.layersRemoved.connect(_clear_project_vector_layers)
+        project.cleared.connect(_clear_project_vector_layers)
+        _project_with_invalidation = project
+        _project_vector_layers = None
+
+    if _project_vector_layers is None:
+        _project_vector_layers = [
+            project_layer
+            for project_layer in project.mapLayers().values()
+            if isinstance(project_layer, QgsVectorLayer)
+            and project_layer.geometryType() != QgsWkbTypes.GeometryType.NullGeometry
+        ]
+    return _project_vector_layers
+
+
 def _find_topologically_related_project_layers(
     layer: QgsVectorLayer,
 ) -> list[QgsVectorLayer]:
-    if not QgsProject.instance().topologicalEditing():
+    project = QgsProject.instance()
+    if not project.topologicalEditing():
         return []
 
     # no advanced config available for topological relations?
+    return _get_project_vector_layers(project)
+
+
+_layer_spatial_indices: dict[str, tuple[QgsSpatialIndex, int]] = {}
+# the layers by id, with the connected slots clearing and forgetting the index
+_layers_with_index_invalidation: dict[
+    str, tuple[QgsVectorLayer, Callable[..., None], Callable[..., None]]
+] = {}
+
+
+def _index_invalidating_signals(layer: QgsVectorLayer) -> list[pyqtBoundSignal]:
     return [
-        project_layer
-        for project_layer in QgsProject.instance().mapLayers().values()
-        if isinstance(project_layer, QgsVectorLayer)
+        layer.featureAdded,
+        layer.featureDeleted,
+        layer.geometryChanged,
+        layer.dataChanged,
+        layer.editingStopped,
+        layer.afterRollBack,
+        layer.afterCommitChanges,
+        # the temporary ids of the added features change on commit
+        layer.committedFeaturesAdded,
+        layer.undoStack().indexChanged,
     ]
 
 
-def _is_same_feature(
-    layer: QgsVectorLayer,
-    feature: QgsFeature,
-    other_layer: QgsVectorLayer,
-    other_feature: QgsFeature,
-) -> bool:
-    return layer.id() == other_layer.id() and feature.id() == other_feature.id()
+def _clear_layer_spatial_index(layer_id: str, *_: object) -> None:
+    _layer_spatial_indices.pop(layer_id, None)
+
+
+def _forget_layer_spatial_index(layer_id: str, *_: object) -> None:
+    _layer_spatial_indices.pop(layer_id, None)
+    _layers_with_index_invalidation.pop(layer_id, None)
+
+
+def clear_layer_spatial_indices() -> None:
+    """
+    Drops the cached spatial indices and disconnects them from the layers.
+    """
+
+    for layer, clear, forget in _layers_with_index_invalidation.values():
+        if sip.isdeleted(layer):
+            continue
+        for signal in _index_invalidating_signals(layer):
+            signal.disconnect(clear)
+        layer.willBeDeleted.disconnect(forget)
+    _layers_with_index_invalidation.clear()
+    _layer_spatial_indices.clear()
+
+
+def _get_layer_spatial_index(layer: QgsVectorLayer) -> Optional[QgsSpatialIndex]:
+    """
+    Returns a spatial index of the layer features if the data provider has
+    none of its own, built once and rebuilt only after the features have changed.
+    """
+
+    if layer.hasSpatialIndex() != QgsFeatureSource.SpatialIndexNotPresent:
+        return None
+
+    layer_id = layer.id()
+    connected = _layers_with_index_invalidation.get(layer_id)
+    # a reloaded project may have a new layer with the same id
+    if connected is None or connected[0] is not layer:
+        _layer_spatial_indices.pop(layer_id, None)
+        clear = functools.partial(_clear_layer_spatial_index, layer_id)
+        forget = functools.partial(_forget_layer_spatial_index, layer_id)
+        for signal in _index_invalidating_signals(layer):
+            signal.connect(clear)
+        layer.willBeDeleted.connect(forget)
+        _layers_with_index_invalidation[layer_id] = (layer, clear, forget)
+
+    # features added directly to the data provider emit no layer signals
+    feature_count = layer.featureCount()
+    index, indexed_feature_count = _layer_spatial_indices.get(layer_id, (None, -1))
+    if index is None or indexed_feature_count != feature_count:
+        index = QgsSpatialIndex(
+            layer.getFeatures(QgsFeatureRequest().setNoAttributes())
+        )
+        _layer_spatial_indices[layer_id] = (index, feature_count)
+    return index
+
+
+def _candidate_features(
+    candidate_layer: QgsVectorLayer,
+    request: QgsFeatureRequest,
+) -> Iterable[QgsFeature]:
+    index = _get_layer_spatial_index(candidate_layer)
+    if index is None:
+        return candidate_layer.getFeatures(request)
+
+    feature_ids = index.intersects(request.filterRect())
+    if not feature_ids:
+        return []
+    return candidate_layer.getFeatures(
+        QgsFeatureRequest(request).setFilterFids(feature_ids)
+    )
 
 
 def find_related_features(
     layer: QgsVectorLayer,
     feature: QgsFeature,
     candidate_layers: Optional[list[QgsVectorLayer]] = None,
-) -> Iterator[tuple[QgsVectorLayer, QgsFeature]]:
+) -> list[tuple[QgsVectorLayer, QgsFeature]]:
+    feature_geometry = feature.geometry()
+    feature_bbox = feature_geometry.boundingBox()
+
     if candidate_layers is None:
         candidate_layers = _find_topologically_related_project_layers(layer)
 
-    feature_geometry = feature.geometry()
-
     feature_geometry_engine = QgsGeometry.createGeometryEngine(
         feature_geometry.constGet()
     )
     feature_geometry_engine.prepareGeometry()
 
     request = QgsFeatureRequest()
-    request.setFilterRect(feature_geometry.boundingBox())  # noqa: SC200
-
-    return (
+    request.setFilterRect(feature_bbox)  # noqa: SC200
+    # only the geometry and the id of the candidates are used
+    request.setNoAttributes()
+
+    # compare the layer ids once per layer to skip the feature itself
+    layer_id, feature_id = layer.id(), feature.id()
+    # collected eagerly, so that the prepared geometry is released
+    # before the related features are processed
+    return [
         (candidate_layer, candidate_feature)
-        for candidate_layer in candidate_layers
-        for candidate_feature in candidate_layer.getFeatures(request)
-        if not _is_same_feature(
-            candidate_layer,
-            candidate_feature,
-            layer,
-            feature,
+        for candidate_layer, is_same_layer in (
+            (candidate_layer, candidate_layer.id() == layer_id)
+            for candidate_layer in candidate_layers
         )
+        for candidate_feature in _candidate_features(candidate_layer, request)
+        if not (is_same_layer and candidate_feature.id() == feature_id)
         and feature_geometry_engine.intersects(candidate_feature.geometry().constGet())
-    )
+    ]
+
 
+def _as_point_or_line_components(
+    geom: QgsGeometry,
+) -> Iterator[QgsAbstractGeometry]:
+    """
+    Yields the parts and polygon rings of the geometry in vertex id order,
+    without cloning them, so they are valid only while geom is alive.
+    """
 
-def _as_point_or_line_components(geom: QgsGeometry) -> Iterator[QgsGeometry]:
     for part in geom.constParts():
         if isinstance(part, QgsPolygon):
-            yield QgsGeometry(part.exteriorRing().clone())
+            yield part.exteriorRing()
             for ring_index in range(part.numInteriorRings()):
-                yield QgsGeometry(part.interiorRing(ring_index).clone())
+                yield part.interiorRing(ring_index)
         else:
-            yield QgsGeometry(part.clone())
+            yield part
 
 
 def _get_geom_component_of_vertex(geom: QgsGeometry, vertex_id: int) -> QgsGeometry:
@@ -156,7 +327,12 @@ def _get_geom_component_of_vertex(geom: QgsGeometry, vertex_id: int) -> QgsGeome
             f"could not find vertex details by index {vertex_id}" f" from {geom}"
         )
 
-    part = list(geom.constParts())[vertex_details.part]
+    abstract_geometry = geom.constGet()
+    part = (
+        abstract_geometry.geometryN(vertex_details.part)
+        if isinstance(abstract_geometry, QgsGeometryCollection)
+        else abstract_geometry
+    )
     if isinstance(part, QgsPolygon):
         if vertex_details.ring == 0:
             return QgsGeometry(part.exteriorRing().clone())
@@ -167,7 +343,9 @@ def _get_geom_component_of_vertex(geom: QgsGeometry, vertex_id: int) -> QgsGeome
 
 
 def _find_vertex_indices(
-    geom: QgsGeometry, segment: "QgsAbstractGeometry"
+    geom: QgsGeometry,
+    segment: "QgsAbstractGeometry",
+    vertex_to_id_map: Optional[dict[Point, int]] = None,
 ) -> list[int]:
     """Returns vertex indices of the geometry for matching vertices in the segment
 
@@ -175,6 +353,8 @@ def _find_vertex_indices(
         geom (QgsGeometry): Geometry whose indices are requested
         segment (QgsAbstractGeometry): Segment geometry (usually QgsPolyline
             or QgsPoint) we want to match
+        vertex_to_id_map (Dict[Point, int], optional): Vertex ids of the geom
+            by coordinates, if already built
 
     Raises:
         ValueError: Raises ValueError if some vertex from segment is not found
@@ -186,14 +366,13 @@ def _find_vertex_indices(
     """
 
     # Loop geometry only once and "cache" indices
-    vertex_to_id_map = {
-        (vertex.x(), vertex.y()): vertex_id for vertex_id, vertex in vertices(geom)
-    }
+    if vertex_to_id_map is None:
+        vertex_to_id_map = _vertex_to_id_map(_all_vertex_coordinates(geom.constGet()))
 
     result: list[int] = []
-    for segment_vertex in segment.vertices():
+    for segment_vertex in _vertex_coordinates(segment):
         try:
-            result.append(vertex_to_id_map[(segment_vertex.x(), segment_vertex.y())])
+            result.append(vertex_to_id_map[segment_vertex])
         except KeyError:
             raise ValueError(
                 f"could not find vertex index for {segment_vertex} from {geom}"
@@ -203,13 +382,10 @@ def _find_vertex_indices(
 
 
 def _check_if_vertices_are_reversed(vertex_indices: list[int]) -> bool:
-    first, second = vertex_indices[:2]
-    return any(
-        [
-            (abs(first - second) == 1 and first > second),
-            (abs(first - second) != 1 and first < second),
-        ]
-    )
+    first, second = vertex_indices[0], vertex_indices[1]
+    step = first - second
+    # a step of one backwards, or a forward jump over the ring closure
+    return step == 1 or step < -1
 
 
 def get_common_geometries(
@@ -218,89 +394,149 @@ def get_common_geometries(
     related_features_by_layer: Iterable[tuple[QgsVectorLayer, QgsFeature]],
     main_feature_segment: tuple[int, int],
 ) -> CommonGeometriesResult:
-    # for now lines and polygons are supported as the trigger
-    if main_feature.geometry().type() not in [
-        QgsWkbTypes.GeometryType.LineGeometry,
-        QgsWkbTypes.GeometryType.PolygonGeometry,
-    ]:
-        raise ValueError(
-            f"unsupported source geometry type {main_feature.geometry().type()}"
-        )
+    trigger_geometry = main_feature.geometry()
+    if trigger_geometry.type() not in _TRIGGER_GEOMETRY_TYPES:
+        raise ValueError(f"unsupported source geometry type {trigger_geometry.type()}")
 
     from_vertex_id, to_vertex_id = main_feature_segment
-    trigger_geometry = main_feature.geometry()
 
     from_vertex = trigger_geometry.vertexAt(from_vertex_id).clone()
     to_vertex = trigger_geometry.vertexAt(to_vertex_id).clone()
 
     # edge that was clicked
-    trigger_segment = frozenset(
-        (
-            (from_vertex.x(), from_vertex.y()),
-            (to_vertex.x(), to_vertex.y()),
-        )
+    trigger_segment = _segment(
+        (from_vertex.x(), from_vertex.y()),
+        (to_vertex.x(), to_vertex.y()),
     )
 
-    # line component that was clicked
+    # line component that was clicked, its vertices are read only once
     trigger_part = _get_geom_component_of_vertex(trigger_geometry, to_vertex_id)
+    trigger_vertices = _vertex_coordinates(trigger_part.constGet())
     # start with the full line component as the result
-    line_segments_to_keep = _as_line_segments(trigger_part)
+    line_segments_to_keep = _line_segments(trigger_vertices)
+    # anything touching the clicked component overlaps its bounding box
+    trigger_bbox = trigger_part.boundingBox()
 
-    common_part_candidates: list[tuple[QgsVectorLayer, QgsFeature]] = []
-    possible_edge_candidates: list[tuple[QgsVectorLayer, QgsFeature, QgsGeometry]] = []
+    common_part_candidates: list[tuple[QgsVectorLayer, QgsFeature, list[Point]]] = []
+    possible_edge_candidates: list[_EdgeCandidate] = []
+    # same line components shared by features of several layers
+    segments_by_component: dict[
+        tuple[int, Point, Point], list[tuple[list[Point], set[Segment]]]
+    ] = {}
 
     for layer, feature in related_features_by_layer:
-        for component in _as_point_or_line_components(feature.geometry()):
+        geometry = feature.geometry()
+        if not _bounding_boxes_overlap(geometry.boundingBox(), trigger_bbox):
+            continue
+        # vertices of all the components in vertex id order, collected in
+        # the same pass for finding the vertex indices of a common part or edge
+        feature_vertices: list[Point] = []
+        for component in _as_point_or_line_components(geometry):
+            component_vertices = _vertex_coordinates(component)
+            feature_vertices.extend(component_vertices)
+
             # found a point which can only act as a break to the segment
             # -> collect as possible edge
-            if component.type() == QgsWkbTypes.GeometryType.PointGeometry:
-                possible_edge_candidates.append((layer, feature, component))
+            if isinstance(component, QgsPoint):
+                possible_edge_candidates.append(
+                    _EdgeCandidate(
+                        layer,
+                        feature,
+                        QgsGeometry(component.clone()),
+                        set(component_vertices),
+                        feature_vertices,
+                    )
+                )
                 continue
 
-            component_segments = _as_line_segments(component)
+            if not _bounding_boxes_overlap(component.boundingBox(), trigger_bbox):
+                continue
+
+            component_segments, is_seen = _component_segments(
+                component_vertices, segments_by_component
+            )
 
             # Found a line that contains the trigger segment.
             # Keep intersection to reduce the result to the part that is shared
             # as common segment.
             # -> collect as common part
             if trigger_segment in component_segments:
-                line_segments_to_keep = line_segments_to_keep.intersection(
-                    component_segments
-                )
-                common_part_candidates.append((layer, feature))
+                if not is_seen:
+                    line_segments_to_keep &= component_segments
+                common_part_candidates.append((layer, feature, feature_vertices))
 
             # Found a line that does not contain trigger segment so remove it from
             # the result.
             # It might still touch the result
             # -> collect as possible edge
             else:
-                line_segments_to_keep = line_segments_to_keep.difference(
-                    component_segments
+                if not is_seen:
+                    line_segments_to_keep -= component_segments
+                possible_edge_candidates.append(
+                    _EdgeCandidate(
+                        layer,
+                        feature,
+                        QgsGeometry(component.clone()),
+                        set(component_vertices),
+                        feature_vertices,
+                    )
                 )
-                possible_edge_candidates.append((layer, feature, component))
 
     segment = _build_line_from_line_segment_set(
         trigger_part,
+        trigger_vertices,
         line_segments_to_keep,
         trigger_segment,
-        edge_candidate_geometries=[
-            geometry for _, _, geometry in possible_edge_candidates
+        edge_candidate_vertices=[
+            candidate.component_vertices for candidate in possible_edge_candidates
         ],
     )
 
-    start, end = QgsGeometry(segment.startPoint()), QgsGeometry(segment.endPoint())
-
     common_parts: list[ReshapeCommonPart] = [
         ReshapeCommonPart(
             main_feature_layer,
             main_feature,
-            _find_vertex_indices(main_feature.geometry(), segment),
+            _find_vertex_indices(trigger_geometry, segment),
             is_reversed=False,
         )
     ]
-    for common_part_candidate in common_part_candidates:
-        layer, feature = common_part_candidate
-        indices = _find_vertex_indices(feature.geometry(), segment)
+    # one vertex id map per feature, shared by its common part and edges
+    vertex_to_id_maps: dict[int, dict[Point, int]] = {}
+    common_parts.extend(
+        _find_common_parts(segment, common_part_candidates, vertex_to_id_maps)
+    )
+
+    edges = _find_edges(segment, possible_edge_candidates, vertex_to_id_maps)
+
+    return CommonGeometriesResult(segment, common_parts, edges)
+
+
+def _bounding_boxes_overlap(first: QgsRectangle, second: QgsRectangle) -> bool:
+    """
+    Compares the bounding boxes by their coordinates, since older QGIS
+    versions treat the all-zero bounding box of a point at the origin as null.
+    """
+
+    return (
+        first.xMinimum() <= second.xMaximum()
+        and second.xMinimum() <= first.xMaximum()
+        and first.yMinimum() <= second.yMaximum()
+        and second.yMinimum() <= first.yMaximum()
+    )
+
+
+def _find_common_parts(
+    segment: QgsLineString,
+    common_part_candidates: list[tuple[QgsVectorLayer, QgsFeature, list[Point]]],
+    vertex_to_id_maps: dict[int, dict[Point, int]],
+) -> list[ReshapeCommonPart]:
+    common_parts: list[ReshapeCommonPart] = []
+    for layer, feature, feature_vertices in common_part_candidates:
+        indices = _find_vertex_indices(
+            feature.geometry(),
+            segment,
+            _cached_vertex_to_id_map(feature_vertices, vertex_to_id_maps),
+        )
         common_parts.append(
             ReshapeCommonPart(
                 layer,
@@ -309,12 +545,83 @@ def get_common_geometries(
                 is_reversed=_check_if_vertices_are_reversed(indices),
             )
         )
+    return common_parts
+
+
+def _component_segments(
+    component_vertices: list[Point],
+    segments_by_component: dict[
+        tuple[int, Point, Point], list[tuple[list[Point], set[Segment]]]
+    ],
+) -> tuple[set[Segment], bool]:
+    """
+    Returns the segments of the line component and whether an equal
+    component was already seen, reusing the segments of the equal component.
+
+    Components are compared in full only if their vertex count and
+    end points match, which is rare for components that are not equal.
+    """
+
+    if not component_vertices:
+        return set(), False
+
+    key = (
+        len(component_vertices),
+        component_vertices[0],
+        component_vertices[-1],
+    )
+    seen_components = segments_by_component.setdefault(key, [])
+    for seen_vertices, seen_segments in seen_components:
+        if seen_vertices == component_vertices:
+            return seen_segments, True
+
+    component_segments = _line_segments(component_vertices)
+    seen_components.append((component_vertices, component_segments))
+    return component_segments, False
+
+
+def _find_edges(
+    segment: QgsLineString,
+    possible_edge_candidates: list[_EdgeCandidate],
+    vertex_to_id_maps: dict[int, dict[Point, int]],
+) -> list[ReshapeEdge]:
+    # prepare the end points only once for all the edge candidates
+    start, end = segment.startPoint(), segment.endPoint()
+    start_xy, end_xy = QgsPointXY(start), QgsPointXY(end)
+    start_vertex, end_vertex = (start.x(), start.y()), (end.x(), end.y())
+    start_engine = QgsGeometry.createGeometryEngine(start)
+    start_engine.prepareGeometry()
+    end_engine = QgsGeometry.createGeometryEngine(end)
+    end_engine.prepareGeometry()
 
     edges: list[ReshapeEdge] = []
-    for possible_edge_candidate in possible_edge_candidates:
-        layer, feature, component = possible_edge_candidate
-        if start.intersects(component):
-            indices = _find_vertex_indices(feature.geometry(), segment.startPoint())
+    for (
+        layer,
+        feature,
+        component,
+        component_vertices,
+        feature_vertices,
+    ) in possible_edge_candidates:
+        # a shared vertex is the usual touch, test other touches with geos
+        # only if the point is in the bounding box
+        component_bbox = component.boundingBox()
+        component_geometry = component.constGet()
+        touches_start = start_vertex in component_vertices or (
+            component_bbox.contains(start_xy)
+            and start_engine.intersects(component_geometry)
+        )
+        touches_end = end_vertex in component_vertices or (
+            component_bbox.contains(end_xy)
+            and end_engine.intersects(component_geometry)
+        )
+        if not touches_start and not touches_end:
+            continue
+
+        vertex_to_id_map = _cached_vertex_to_id_map(feature_vertices, vertex_to_id_maps)
+        feature_geometry = feature.geometry()
+
+        if touches_start:
+            indices = _find_vertex_indices(feature_geometry, start, vertex_to_id_map)
             edges.append(
                 ReshapeEdge(
                     layer,
@@ -323,8 +630,8 @@ def get_common_geometries(
                     is_start=True,
                 )
             )
-        if end.intersects(component):
-            indices = _find_vertex_indices(feature.geometry(), segment.endPoint())
+        if touches_end:
+            indices = _find_vertex_indices(feature_geometry, end, vertex_to_id_map)
             edges.append(
                 ReshapeEdge(
                     layer,
@@ -334,81 +641,163 @@ def get_common_geometries(
                 )
             )
 
-    return CommonGeometriesResult(segment, common_parts, edges)
+    return edges
+
+
+def _vertex_coordinates(geometry: QgsAbstractGeometry) -> list[Point]:
+    """
+    Returns the xy coordinates of the geometry vertices, read from
+    the coordinate arrays directly for line strings.
+    """
+
+    if isinstance(geometry, QgsLineString):
+        return list(zip(geometry.xVector(), geometry.yVector()))
+    return [(point.x(), point.y()) for point in geometry.vertices()]
+
+
+def _vertex_to_id_map(vertices: list[Point]) -> dict[Point, int]:
+    # the vertex ids are consecutive, so the map is built without
+    # a Python level loop, a repeated vertex maps to its last id
+    return dict(zip(vertices, itertools.count()))
+
+
+def _cached_vertex_to_id_map(
+    feature_vertices: list[Point],
+    vertex_to_id_maps: dict[int, dict[Point, int]],
+) -> dict[Point, int]:
+    # keyed by the identity of the vertex list collected once per feature
+    vertex_to_id_map = vertex_to_id_maps.get(id(feature_vertices))
+    if vertex_to_id_map is None:
+        vertex_to_id_map = _vertex_to_id_map(feature_vertices)
+        vertex_to_id_maps[id(feature_vertices)] = vertex_to_id_map
+    return vertex_to_id_map
+
+
+def _all_vertex_coordinates(geometry: Optional[QgsAbstractGeometry]) -> list[Point]:
+    """
+    Returns the xy coordinates of all the vertices of the geometry,
+    in the same order as the vertex ids of the geometry.
+    """
+
+    if geometry is None:
+        return []
+    if isinstance(geometry, QgsGeometryCollection):
+        return [
+            coordinates
+            for part_index in range(geometry.numGeometries())
+            for coordinates in _all_vertex_coordinates(geometry.geometryN(part_index))
+        ]
+    if isinstance(geometry, QgsCurvePolygon):
+        rings = [geometry.exteriorRing()] + [
+            geometry.interiorRing(ring_index)
+            for ring_index in range(geometry.numInteriorRings())
+        ]
+        return [
+            coordinates
+            for ring in rings
+            for coordinates in _all_vertex_coordinates(ring)
+        ]
+    return _vertex_coordinates(geometry)
 
 
-def _as_line_segments(geometry: QgsGeometry) -> set[Segment]:
-    vertices = [(point.x(), point.y()) for point in geometry.vertices()]
-    return {frozenset(line) for line in zip(vertices, vertices[1:])}
+def _segment(start: Point, end: Point) -> Segment:
+    return (start, end) if start <= end else (end, start)
+
+
+def _line_segments(vertices: list[Point]) -> set[Segment]:
+    # same ordering as in _segment, inlined for the long vertex lists
+    return {
+        (start, end) if start <= end else (end, start)
+        for start, end in zip(vertices, vertices[1:])
+    }
 
 
 def _build_line_from_line_segment_set(
     trigger_part: QgsGeometry,
+    trigger_vertices: list[Point],
     line_segments_to_keep: set[Segment],
     trigger_segment: Segment,
-    edge_candidate_geometries: list[QgsGeometry],
+    edge_candidate_vertices: list[set[Point]],
 ) -> QgsLineString:
     """Build a subline from trigger_part with constraints
 
     Builds a line which contains the trigger_segment and has only segments from
     line_segments_to_keep set and which is split at points where any geometry
-    from edge_candidate_geometries touches the line.
+    from edge_candidate_vertices touches the line.
 
     Args:
         trigger_part (QgsGeometry): Input geometry from where the subline is extracted
+        trigger_vertices (List[Point]): Vertex coordinates of the trigger_part
         line_segments_to_keep (Set[Segment]): Set of segments that the subline is build
             from
         trigger_segment (Segment): Edge which was clicked
-        edge_candidate_geometries (List[QgsGeometry]): List of geometries which might
-            act as break points
+        edge_candidate_vertices (List[Set[Point]]): Vertex coordinates of the
+            geometries which might act as break points
 
     Returns:
         QgsLineString: A sublinestring from the input geometry that follows the
             constraints
     """
 
+    # the candidate vertices were already read while collecting the candidates
+    trigger_vertex_set = set(trigger_vertices)
     possible_split_points = {
-        (vertex.x(), vertex.y())
-        for geom in edge_candidate_geometries
-        for vertex in geom.vertices()
-    } & {(vertex.x(), vertex.y()) for vertex in trigger_part.vertices()}
-
-    vertex_iterator = trigger_part.vertices()
-    next_vertex_iterator = trigger_part.vertices()
-    _ = next(next_vertex_iterator)  # advance the next_vertex iterator by one
-
-    parts: list[list[QgsPoint]] = []
-    current_part_vertices: list[QgsPoint] = []
-    for vertex, next_vertex in zip(vertex_iterator, next_vertex_iterator):
-        vertex_tuple = (vertex.x(), vertex.y())
-        next_vertex_tuple = (next_vertex.x(), next_vertex.y())
-        segment = frozenset((vertex_tuple, next_vertex_tuple))
+        vertex
+        for vertices in edge_candidate_vertices
+        for vertex in vertices
+        if vertex in trigger_vertex_set
+    }
+
+    # nothing removed and nowhere to split, the whole part is the subline,
+    # the kept segments are a subset of the distinct trigger part segments
+    # so they are all kept only if their count is the segment count
+    trigger_line = trigger_part.constGet()
+    if (
+        not possible_split_points
+        and len(line_segments_to_keep) == len(trigger_vertices) - 1
+        and isinstance(trigger_line, QgsLineString)
+    ):
+        return trigger_line.clone()
+
+    # collect the parts as vertex indices, only the returned part is
+    # read back as points from the trigger part
+    parts: list[list[int]] = []
+    current_part_indices: list[int] = []
+    for index, (vertex_tuple, next_vertex_tuple) in enumerate(
+        zip(trigger_vertices, trigger_vertices[1:])
+    ):
+        segment = _segment(vertex_tuple, next_vertex_tuple)
 
         if segment in line_segments_to_keep:
             if segment == trigger_segment:
                 trigger_in_part = len(parts)  # this will be the index of this part
 
-            if not current_part_vertices:
-                current_part_vertices.append(vertex.clone())
-            current_part_vertices.append(next_vertex.clone())
-        elif current_part_vertices:
-            parts.append(current_part_vertices)
-            current_part_vertices = []
+            if not current_part_indices:
+                current_part_indices.append(index)
+            current_part_indices.append(index + 1)
+        elif current_part_indices:
+            parts.append(current_part_indices)
+            current_part_indices = []
 
-        if next_vertex_tuple in possible_split_points and current_part_vertices:
-            parts.append(current_part_vertices)
-            current_part_vertices = []
+        if next_vertex_tuple in possible_split_points and current_part_indices:
+            parts.append(current_part_indices)
+            current_part_indices = []
 
-    if current_part_vertices:
-        parts.append(current_part_vertices)
+    if current_part_indices:
+        parts.append(current_part_indices)
 
-    if _is_linear_ring_split(parts) and trigger_in_part in (0, len(parts) - 1):
+    trigger_in_end_part = trigger_in_part in (0, len(parts) - 1)
+    if _is_linear_ring_split(parts, trigger_vertices) and trigger_in_end_part:
         # The original geometry was a linear ring and was split at middle.
         # The trigger segment is in the first or last part so those must be merged.
-        return QgsLineString(parts[-1] + parts[0][1:])
+        part_indices = parts[-1] + parts[0][1:]
     else:
-        return QgsLineString(parts[trigger_in_part])
+        part_indices = parts[trigger_in_part]
+    return QgsLineString([trigger_part.vertexAt(index) for index in part_indices])
 
 
-def _is_linear_ring_split(parts: list[list[QgsPoint]]) -> bool:
-    return len(parts) >= 2 and parts[0][0] == parts[-1][-1]  # noqa: PLR2004
+def _is_linear_ring_split(parts: list[list[int]], vertices: list[Point]) -> bool:
+    return (
+        len(parts) >= 2  # noqa: PLR2004
+        and vertices[parts[0][0]] == vertices[parts[-1][-1]]
+    )
@@ -28,7 +28,8 @@ def clone_geometry_safely(
     geometry: Union[QgsGeometry, QgsAbstractGeometry]
 ) -> QgsGeometry:
     if isinstance(geometry, QgsGeometry):
-        original_abstract_geometry = geometry.get()
+        # get() would detach a shared geometry, copying it once more
+        original_abstract_geometry = geometry.constGet()
         cloned_original_abstract_geometry = original_abstract_geometry.clone()
         return QgsGeometry(cloned_original_abstract_geometry)
     else:
@@ -33,7 +33,9 @@ from qgis_plugin_tools.tools.resources import resources_path
 from segment_reshape.map_tool.segment_reshape_tool import (
     SegmentReshapeTool,
     SegmentReshapeToolHandler,
+    clear_shared_identify_tool,
 )
+from segment_reshape.topology import find_related
 
 import segment_reshape_plugin
 
@@ -92,5 +94,9 @@ class SegmentReshapePlugin(QObject):
             self.toolbar.deleteLater()
         self.toolbar = None
 
+        find_related.clear_layer_spatial_indices()
+        find_related.clear_project_vector_layers_cache()
+        clear_shared_identify_tool()
+
         self._teardown_loggers()
         self._teardown_loggers = lambda: None
@@ -26,6 +26,7 @@ from segment_reshape.geometry.reshape import (
     GeometryTransformationError,
     ReshapeCommonPart,
     ReshapeEdge,
+    _EditSession,
     _move_edges,
     make_reshape_edits,
 )
@@ -63,13 +64,30 @@ def test_editing_enabled_for_non_editable_layers(
             ReshapeCommonPart(layer2, features2[0], [0, 1], False),
         ],
         [],
-        QgsLineString([(0, 0), (1, 1)]),
+        QgsLineString([(0, 0), (1, 2)]),
     )
 
     assert layer1.isEditable()
     assert layer2.isEditable()
 
 
+def test_editing_not_enabled_when_reshape_changes_nothing(
+    preset_features_layer_factory: Callable[
+        [str, list[str]], tuple[QgsVectorLayer, list[QgsFeature]]
+    ]
+):
+    layer1, features1 = preset_features_layer_factory("l1", ["LINESTRING(0 0, 1 1)"])
+
+    make_reshape_edits(
+        [ReshapeCommonPart(layer1, features1[0], [0, 1], False)],
+        [],
+        QgsLineString([(0, 0), (1, 1)]),
+    )
+
+    assert not layer1.isEditable()
+    assert layer1.undoStack().count() == 0
+
+
 def test_edits_made_in_single_edit_command_for_each_layer(
     preset_features_layer_factory: Callable[
         [str, list[str]], tuple[QgsVectorLayer, list[QgsFeature]]
@@ -90,7 +108,7 @@ def test_edits_made_in_single_edit_command_for_each_layer(
             ReshapeCommonPart(layer2, features2[1], [0, 1], False),
         ],
         [],
-        QgsLineString([(0, 0), (1, 1)]),
+        QgsLineString([(0, 0), (1, 2)]),
     )
 
     assert not layer1.isEditCommandActive()
@@ -163,7 +181,7 @@ def test_edit_commands_for_editable_layers_removed_on_error(
                 ReshapeCommonPart(layer2, features2[1], [0, 1], False),
             ],
             [],
-            QgsLineString([(0, 0), (1, 1)]),
+            QgsLineString([(0, 0), (1, 2)]),
         )
 
     assert layer1.isEditable()
@@ -201,7 +219,7 @@ def test_non_editable_layer_rolled_back_on_error(
                 ReshapeCommonPart(layer2, features2[1], [0, 1], False),
             ],
             [],
-            QgsLineString([(0, 0), (1, 1)]),
+            QgsLineString([(0, 0), (1, 2)]),
         )
 
     assert not layer1.isEditable()
@@ -872,6 +890,27 @@ def test_polygon_segment_collapsed_to_single_point_with_wraparound(
     _assert_layer_geoms(layer1, ["POLYGON((-1 -3, 1 1, 2 2, 3 3, -1 -3))"])
 
 
+def test_polygon_hole_collapsed_to_single_point_is_removed(
+    preset_features_layer_factory: Callable[
+        [str, list[str]], tuple[QgsVectorLayer, list[QgsFeature]]
+    ],
+):
+    layer1, features1 = preset_features_layer_factory(
+        "l1",
+        ["POLYGON((0 0, 0 10, 10 10, 10 0, 0 0), (4 4, 4 6, 6 6, 6 4, 4 4))"],
+    )
+
+    make_reshape_edits(
+        [
+            ReshapeCommonPart(layer1, features1[0], [5, 6, 7], False),
+        ],
+        [],
+        QgsPoint(5, 5),
+    )
+
+    _assert_layer_geoms(layer1, ["POLYGON((0 0, 0 10, 10 10, 10 0, 0 0))"])
+
+
 def test_multipolygon_segment_collapsed_to_single_point_with_wraparound(
     preset_features_layer_factory: Callable[
         [str, list[str]], tuple[QgsVectorLayer, list[QgsFeature]]
@@ -975,6 +1014,99 @@ def test_line_segment_expanded_from_single_vertex(
     _assert_layer_geoms(layer1, ["LINESTRING(0 0, 0.5 0.5, 1.5 1.5, 2 2)"])
 
 
+@pytest.mark.parametrize(
+    argnames=("input_wkt", "reshape_wkt", "indices", "expected_wkt"),
+    argvalues=[
+        (
+            "LINESTRING(0 0, 1 1, 2 2)",
+            "LINESTRING Z(0.5 0.5 5, 1.5 1.5 5)",
+            [1],
+            "LINESTRING(0 0, 0.5 0.5, 1.5 1.5, 2 2)",
+        ),
+        (
+            "POLYGON((0 0, 0 10, 10 10, 10 0, 0 0))",
+            "LINESTRING Z(0 9 5, 9 9 5)",
+            [1, 2],
+            "POLYGON((0 0, 0 9, 9 9, 10 0, 0 0))",
+        ),
+        (
+            "LINESTRING Z(0 0 1, 1 1 1, 2 2 1)",
+            "LINESTRING Z(0.5 0.5 5, 1.5 1.5 5)",
+            [1],
+            "LINESTRING Z(0 0 1, 0.5 0.5 5, 1.5 1.5 5, 2 2 1)",
+        ),
+    ],
+    ids=["z-dropped-from-line", "z-dropped-from-polygon", "z-kept"],
+)
+def test_reshaped_geometry_keeps_original_dimensions(
+    preset_features_layer_factory: Callable[
+        [str, list[str]], tuple[QgsVectorLayer, list[QgsFeature]]
+    ],
+    input_wkt: str,
+    reshape_wkt: str,
+    indices: list[int],
+    expected_wkt: str,
+):
+    layer1, features1 = preset_features_layer_factory("l1", [input_wkt])
+
+    reshape = QgsLineString()
+    reshape.fromWkt(reshape_wkt)
+
+    make_reshape_edits(
+        [
+            ReshapeCommonPart(layer1, features1[0], indices, False),
+        ],
+        [],
+        reshape,
+    )
+
+    _assert_layer_geoms(layer1, [expected_wkt])
+
+
+def test_long_line_segment_reshaped(
+    preset_features_layer_factory: Callable[
+        [str, list[str]], tuple[QgsVectorLayer, list[QgsFeature]]
+    ],
+):
+    def _line_wkt(coordinates: list[tuple[float, float]]) -> str:
+        return f"LINESTRING({', '.join(f'{x} {y}' for x, y in coordinates)})"
+
+    coordinates = [(x, 0) for x in range(1000)]
+    layer1, features1 = preset_features_layer_factory("l1", [_line_wkt(coordinates)])
+
+    make_reshape_edits(
+        [
+            ReshapeCommonPart(layer1, features1[0], [1, 2, 3], False),
+        ],
+        [],
+        QgsLineString([(1, 1), (3, 1)]),
+    )
+
+    _assert_layer_geoms(layer1, [_line_wkt([(0, 0), (1, 1), (3, 1), *coordinates[4:]])])
+
+
+def test_long_line_segment_collapsed_to_single_point(
+    preset_features_layer_factory: Callable[
+        [str, list[str]], tuple[QgsVectorLayer, list[QgsFeature]]
+    ],
+):
+    def _line_wkt(coordinates: list[tuple[float, float, float]]) -> str:
+        return f"LINESTRING Z({', '.join(f'{x} {y} {z}' for x, y, z in coordinates)})"
+
+    coordinates = [(x, 0, 5) for x in range(1000)]
+    layer1, features1 = preset_features_layer_factory("l1", [_line_wkt(coordinates)])
+
+    make_reshape_edits(
+        [
+            ReshapeCommonPart(layer1, features1[0], [1, 2, 3], False),
+        ],
+        [],
+        QgsPoint(2, 1),
+    )
+
+    _assert_layer_geoms(layer1, [_line_wkt([(0, 0, 5), (2, 1, 5), *coordinates[4:]])])
+
+
 def test_polygon_segment_expanded_from_single_vertex(
     preset_features_layer_factory: Callable[
         [str, list[str]], tuple[QgsVectorLayer, list[QgsFeature]]
@@ -1175,6 +1307,37 @@ def test_wraparound_closed_linestring_partially_reshaped(
     _assert_layer_geoms(layer, [result])
 
 
+@pytest.mark.parametrize(
+    argnames=("original", "expected_origin"),
+    argvalues=[
+        ("LINESTRING M(0 0 1, 0 1 2, 1 1 3, 1 0 4, 0 0 1)", "POINT M(-1 -1 1)"),
+        ("LINESTRING Z(0 0 1, 0 1 2, 1 1 3, 1 0 4, 0 0 1)", "POINT Z(-1 -1 1)"),
+    ],
+    ids=["m", "z"],
+)
+def test_wraparound_closed_linestring_moved_origin_keeps_original_dimensions(
+    preset_features_layer_factory: Callable[
+        [str, list[str]], tuple[QgsVectorLayer, list[QgsFeature]]
+    ],
+    original: str,
+    expected_origin: str,
+):
+    layer, (feature,) = preset_features_layer_factory("l1", [original])
+
+    make_reshape_edits(
+        [
+            ReshapeCommonPart(layer, feature, [4, 1], False),
+        ],
+        [],
+        QgsLineString([(-1, -1), (0, 2)]),
+    )
+
+    expected = QgsPoint()
+    assert expected.fromWkt(expected_origin)
+    (reshaped,) = layer.getFeatures()
+    assert reshaped.geometry().constGet().endPoint() == expected
+
+
 @pytest.mark.parametrize(
     argnames=(
         "new_start_wkt",
@@ -1195,11 +1358,11 @@ def test_wraparound_closed_linestring_partially_reshaped(
     ],
     ids=["edge not moved", "edge moved"],
 )
-@pytest.mark.usefixtures("_with_editable_layers")
 def test_move_edges(
     preset_features_layer_factory: Callable[
         [str, list[str]], tuple[QgsVectorLayer, list[QgsFeature]]
     ],
+    edit_session: _EditSession,
     new_start_wkt: str,
     new_end_wkt: str,
     expected_layer_editable: bool,
@@ -1219,6 +1382,6 @@ def test_move_edges(
 
     assert not layer1.isEditable()
 
-    _move_edges(edges, new_start, new_end)
+    _move_edges(edges, new_start, new_end, edit_session)
 
     assert layer1.isEditable() == expected_layer_editable
@@ -37,7 +37,13 @@ from qgis.gui import QgsMapMouseEvent, QgsMapToolIdentify
 from qgis.PyQt.QtCore import QEvent, QPoint, Qt
 from qgis.PyQt.QtGui import QKeyEvent
 from segment_reshape.geometry import reshape
-from segment_reshape.map_tool.segment_reshape_tool import SegmentReshapeTool, ToolMode
+from segment_reshape.map_tool.segment_reshape_tool import (
+    SegmentReshapeTool,
+    ToolMode,
+    _shared_identify_tool_for,
+    clear_shared_identify_tool,
+)
+from segment_reshape.topology import find_related
 
 if TYPE_CHECKING:
     from typing import Protocol
@@ -261,6 +267,28 @@ def test_left_mouse_click_in_reshape_mode_adds_points_to_maptool(
     m_make_reshape_edits.assert_not_called()
 
 
+@pytest.mark.usefixtures("_add_layer")
+def test_repeated_left_mouse_click_in_reshape_mode_adds_point_only_once(
+    qgis_canvas: QgsMapCanvas,
+    mouse_event_factory: "MouseEventFactoryType",
+):
+    map_tool = SegmentReshapeTool(qgis_canvas)
+    qgis_canvas.setMapTool(map_tool)
+
+    old_geom = QgsGeometry.fromWkt("LINESTRING(0 0, 1 1)")
+    map_tool._change_to_reshape_mode_for_geom(old_geom)
+
+    for _ in range(2):
+        map_release = mouse_event_factory(
+            MOUSE_LOCATION,
+            QEvent.MouseButtonRelease,
+            Qt.LeftButton,
+        )
+        map_tool.canvasReleaseEvent(map_release)
+
+    assert map_tool.captureCurve().curveToLine().asWkt() == "LineString (1.5 1.5)"
+
+
 @pytest.mark.usefixtures("_add_layer")
 @pytest.mark.parametrize(
     ("points_to_remove", "expected_new"),
@@ -434,3 +462,172 @@ def test_find_common_segment_should_return_shared_segment(
     assert segment_layer == layer
 
     assert QgsGeometry(segment).isGeosEqual(QgsGeometry.fromWkt("LINESTRING(1 1, 2 2)"))
+
+
+@pytest.mark.usefixtures("_use_topological_editing")
+def test_find_common_segment_should_search_again_after_related_layer_is_edited(
+    qgis_iface: QgisInterface,
+    map_tool: SegmentReshapeTool,
+    mocker: MockerFixture,
+    preset_features_layer_factory: Callable[
+        [str, list[str]], tuple[QgsVectorLayer, list[QgsFeature]]
+    ],
+):
+    layer, (base_feature, *_) = preset_features_layer_factory(
+        "l1",
+        [
+            "LINESTRING(0 0, 1 1, 2 2, 3 3)",  # base
+            "LINESTRING(1 0, 1 1, 2 2, 2 0)",  # partly common
+        ],
+    )
+
+    QgsProject.instance().addMapLayer(layer)
+    qgis_iface.setActiveLayer(layer)
+
+    results = _create_identify_result([(base_feature, layer)])
+    mocker.patch.object(QgsMapToolIdentify, "identify", return_value=results)
+
+    map_tool._find_common_segment(MOUSE_LOCATION)
+
+    # edit without a canvas refresh
+    layer.startEditing()
+    layer.addFeature(QgsFeature())
+
+    m_find_segment_to_reshape = mocker.spy(find_related, "find_segment_to_reshape")
+
+    map_tool._find_common_segment(MOUSE_LOCATION)
+
+    m_find_segment_to_reshape.assert_called_once()
+
+    layer.rollBack()
+
+
+def test_find_common_segment_should_identify_repeated_pick_only_once(
+    qgis_iface: QgisInterface,
+    map_tool: SegmentReshapeTool,
+    mocker: MockerFixture,
+    preset_features_layer_factory: Callable[
+        [str, list[str]], tuple[QgsVectorLayer, list[QgsFeature]]
+    ],
+):
+    layer, (base_feature, *_) = preset_features_layer_factory(
+        "l1",
+        [
+            "LINESTRING(0 0, 1 1, 2 2, 3 3)",  # base
+            "LINESTRING(1 0, 1 1, 2 2, 2 0)",  # partly common
+        ],
+    )
+
+    QgsProject.instance().addMapLayer(layer)
+    qgis_iface.setActiveLayer(layer)
+
+    results = _create_identify_result([(base_feature, layer)])
+    m_identify = mocker.patch.object(
+        QgsMapToolIdentify, "identify", return_value=results
+    )
+
+    map_tool._change_to_pick_location_mode()
+    map_tool._find_common_segment(MOUSE_LOCATION)
+    map_tool._change_to_pick_location_mode()
+    segment, segment_layer = map_tool._find_common_segment(MOUSE_LOCATION)
+
+    m_identify.assert_called_once()
+    assert segment_layer == layer
+    assert QgsGeometry(segment.clone()).isGeosEqual(
+        QgsGeometry.fromWkt("LINESTRING(1 1, 2 2)")
+    )
+
+
+def test_find_common_segment_should_identify_again_after_active_layer_is_edited(
+    qgis_iface: QgisInterface,
+    map_tool: SegmentReshapeTool,
+    mocker: MockerFixture,
+    preset_features_layer_factory: Callable[
+        [str, list[str]], tuple[QgsVectorLayer, list[QgsFeature]]
+    ],
+):
+    layer, (feature,) = preset_features_layer_factory(
+        "l1", ["LINESTRING(0 0, 1 1, 2 2, 3 3)"]
+    )
+
+    QgsProject.instance().addMapLayer(layer)
+    qgis_iface.setActiveLayer(layer)
+
+    m_identify = mocker.patch.object(QgsMapToolIdentify, "identify", return_value=[])
+
+    map_tool._find_common_segment(MOUSE_LOCATION)
+    assert map_tool._segments_at_locations
+
+    # edit without a canvas refresh
+    layer.startEditing()
+    layer.changeGeometry(
+        feature.id(), QgsGeometry.fromWkt("LINESTRING(0 0, 1.5 1.5, 3 3)")
+    )
+
+    assert not map_tool._segments_at_locations
+
+    map_tool._find_common_segment(MOUSE_LOCATION)
+
+    assert m_identify.call_count == 2
+
+    layer.rollBack()
+
+
+@pytest.mark.usefixtures("_use_topological_editing")
+def test_repeated_pick_after_cancel_keeps_the_segment_to_reshape(
+    qgis_iface: QgisInterface,
+    map_tool: SegmentReshapeTool,
+    mocker: MockerFixture,
+    mouse_event_factory: "MouseEventFactoryType",
+    preset_features_layer_factory: Callable[
+        [str, list[str]], tuple[QgsVectorLayer, list[QgsFeature]]
+    ],
+):
+    layer, (base_feature, *_) = preset_features_layer_factory(
+        "l1",
+        [
+            "LINESTRING(0 0, 1 1, 2 2, 3 3)",  # base
+            "LINESTRING(1 0, 1 1, 2 2, 2 0)",  # partly common
+        ],
+    )
+
+    QgsProject.instance().addMapLayer(layer)
+    qgis_iface.setActiveLayer(layer)
+
+    results = _create_identify_result([(base_feature, layer)])
+    mocker.patch.object(QgsMapToolIdentify, "identify", return_value=results)
+
+    map_tool._change_to_pick_location_mode()
+    escape_press = QKeyEvent(QEvent.KeyPress, Qt.Key_Escape, Qt.NoModifier)
+    for _ in range(2):
+        map_release = mouse_event_factory(
+            MOUSE_LOCATION,
+            QEvent.MouseButtonRelease,
+            Qt.LeftButton,
+        )
+        map_tool.canvasReleaseEvent(map_release)
+        assert map_tool._tool_mode == ToolMode.RESHAPE
+        map_tool.keyPressEvent(escape_press)
+
+    map_release = mouse_event_factory(
+        MOUSE_LOCATION,
+        QEvent.MouseButtonRelease,
+        Qt.LeftButton,
+    )
+    map_tool.canvasReleaseEvent(map_release)
+
+    expected = QgsGeometry.fromWkt("LINESTRING(1 1, 2 2)")
+    assert map_tool._common_segment_to_reshape.isGeosEqual(expected)
+    assert map_tool.old_segment_rubber_band.asGeometry().isGeosEqual(expected)
+    assert QgsGeometry(map_tool.find_segment_results.segment.clone()).isGeosEqual(
+        expected
+    )
+
+
+def test_shared_identify_tool_created_again_after_clear(qgis_canvas: QgsMapCanvas):
+    identify_tool = _shared_identify_tool_for(qgis_canvas)
+    assert _shared_identify_tool_for(qgis_canvas) is identify_tool
+
+    clear_shared_identify_tool()
+
+    assert _shared_identify_tool_for(qgis_canvas) is not identify_tool
@@ -21,9 +21,17 @@ from time import perf_counter
 from typing import Callable, Union
 
 import pytest
-from qgis.core import QgsFeature, QgsGeometry, QgsPointXY, QgsProject, QgsVectorLayer
+from qgis.core import (
+    QgsFeature,
+    QgsGeometry,
+    QgsPointXY,
+    QgsProject,
+    QgsVectorLayer,
+    QgsVectorLayerUtils,
+)
 from segment_reshape.topology.find_related import (
     _find_vertex_indices,
+    clear_project_vector_layers_cache,
     find_related_features,
     get_common_geometries,
 )
@@ -288,10 +296,17 @@ def test_calculate_common_segment_for_same_polygon_at_both_edges(
             ["LINESTRING(3 3, 2 2, 1 1, 0 0, -1 -1)"],
             [([0, 1, 2], False), ([3, 2, 1], True)],
         ),
+        (
+            "LINESTRING(0 0, 1 1, 2 2)",
+            (0, 1),
+            ["LINESTRING(0 0, 1 1)", "LINESTRING(0 0, 1 1)"],
+            [([0, 1], False), ([0, 1], False), ([0, 1], False)],
+        ),
     ],
     ids=[
         "other-fully-common-with-trigger",
         "other-fully-common-with-trigger-reversed",
+        "others-equal-lines",
     ],
 )
 def test_calculate_common_segment_for_multiple_lines_results_in_multiple_reshape_parts(
@@ -938,6 +953,58 @@ def test_find_related_features_results_by_default_from_project_vector_layers(
     assert layer_ids == [layer1.id(), layer2.id()]
 
 
+@pytest.mark.usefixtures("qgis_new_project", "_use_topological_editing")
+def test_find_related_features_by_default_sees_layers_added_after_previous_call(
+    preset_features_layer_factory: Callable[
+        [str, list[str]], tuple[QgsVectorLayer, list[QgsFeature]]
+    ]
+):
+    source_layer, (source_feature,) = preset_features_layer_factory(
+        "source", ["LINESTRING(0 0, 1 1)"]
+    )
+    layer1, _ = preset_features_layer_factory("l1", ["LINESTRING(0 0, 1 1)"])
+    layer2, _ = preset_features_layer_factory("l2", ["LINESTRING(0 0, 1 1)"])
+
+    QgsProject.instance().addMapLayers([layer1])
+    list(find_related_features(source_layer, source_feature))
+    QgsProject.instance().addMapLayers([layer2])
+
+    results = find_related_features(source_layer, source_feature)
+
+    layer_ids = [layer.id() for layer, _ in results]
+
+    assert layer_ids == [layer1.id(), layer2.id()]
+
+
+@pytest.mark.usefixtures("qgis_new_project", "_use_topological_editing")
+def test_find_related_features_reconnects_to_project_after_clearing_cache(
+    preset_features_layer_factory: Callable[
+        [str, list[str]], tuple[QgsVectorLayer, list[QgsFeature]]
+    ]
+):
+    source_layer, (source_feature,) = preset_features_layer_factory(
+        "source", ["LINESTRING(0 0, 1 1)"]
+    )
+    layer1, _ = preset_features_layer_factory("l1", ["LINESTRING(0 0, 1 1)"])
+    layer2, _ = preset_features_layer_factory("l2", ["LINESTRING(0 0, 1 1)"])
+
+    QgsProject.instance().addMapLayers([layer1])
+    list(find_related_features(source_layer, source_feature))
+
+    clear_project_vector_layers_cache()
+    # already disconnected, nothing to disconnect again
+    clear_project_vector_layers_cache()
+
+    list(find_related_features(source_layer, source_feature))
+    QgsProject.instance().addMapLayers([layer2])
+
+    results = find_related_features(source_layer, source_feature)
+
+    layer_ids = [layer.id() for layer, _ in results]
+
+    assert layer_ids == [layer1.id(), layer2.id()]
+
+
 @pytest.mark.usefixtures("qgis_new_project")
 def test_find_related_features_uses_custom_list_if_given_if_topological_editing_disabled(
     preset_features_layer_factory: Callable[
@@ -1028,3 +1095,141 @@ def test_find_related_features_finds_features_touching_the_target(
     )
 
     assert len(results) == 1 + 2 + 2
+
+
+@pytest.mark.usefixtures("qgis_new_project")
+def test_find_related_features_sees_layer_edits_after_previous_call(
+    preset_features_layer_factory: Callable[
+        [str, list[str]], tuple[QgsVectorLayer, list[QgsFeature]]
+    ]
+):
+    source_layer, (source_feature,) = preset_features_layer_factory(
+        "source", ["LINESTRING(0 0, 1 1)"]
+    )
+    layer1, (feature1,) = preset_features_layer_factory(
+        "l1", ["LINESTRING(3 0, 0 3)"]  # not touching
+    )
+
+    assert (
+        find_related_features(source_layer, source_feature, candidate_layers=[layer1])
+        == []
+    )
+
+    layer1.startEditing()
+    layer1.changeGeometry(feature1.id(), QgsGeometry.fromWkt("LINESTRING(1 0, 0 1)"))
+
+    results = find_related_features(
+        source_layer, source_feature, candidate_layers=[layer1]
+    )
+
+    assert [feature.id() for _, feature in results] == [feature1.id()]
+
+    layer1.rollBack()
+
+
+@pytest.mark.usefixtures("qgis_new_project")
+def test_find_related_features_sees_undone_layer_edits(
+    preset_features_layer_factory: Callable[
+        [str, list[str]], tuple[QgsVectorLayer, list[QgsFeature]]
+    ]
+):
+    source_layer, (source_feature,) = preset_features_layer_factory(
+        "source", ["LINESTRING(0 0, 1 1)"]
+    )
+    layer1, (feature1,) = preset_features_layer_factory(
+        "l1", ["LINESTRING(3 0, 0 3)"]  # not touching
+    )
+
+    layer1.startEditing()
+    layer1.changeGeometry(feature1.id(), QgsGeometry.fromWkt("LINESTRING(1 0, 0 1)"))
+
+    assert (
+        len(
+            find_related_features(
+                source_layer, source_feature, candidate_layers=[layer1]
+            )
+        )
+        == 1
+    )
+
+    layer1.undoStack().undo()
+
+    assert (
+        find_related_features(source_layer, source_feature, candidate_layers=[layer1])
+        == []
+    )
+
+    layer1.rollBack()
+
+
+@pytest.mark.usefixtures("qgis_new_project")
+def test_find_related_features_sees_rolled_back_layer_edits(
+    preset_features_layer_factory: Callable[
+        [str, list[str]], tuple[QgsVectorLayer, list[QgsFeature]]
+    ]
+):
+    source_layer, (source_feature,) = preset_features_layer_factory(
+        "source", ["LINESTRING(0 0, 1 1)"]
+    )
+    layer1, _ = preset_features_layer_factory(
+        "l1", ["LINESTRING(3 0, 0 3)"]  # not touching
+    )
+
+    layer1.startEditing()
+    layer1.addFeature(
+        QgsVectorLayerUtils.createFeature(
+            layer1, QgsGeometry.fromWkt("LINESTRING(1 0, 0 1)")
+        )
+    )
+
+    assert (
+        len(
+            find_related_features(
+                source_layer, source_feature, candidate_layers=[layer1]
+            )
+        )
+        == 1
+    )
+
+    layer1.rollBack()
+
+    assert (
+        find_related_features(source_layer, source_feature, candidate_layers=[layer1])
+        == []
+    )
+
+
+@pytest.mark.usefixtures("qgis_new_project")
+def test_find_related_features_sees_committed_added_features(
+    preset_features_layer_factory: Callable[
+        [str, list[str]], tuple[QgsVectorLayer, list[QgsFeature]]
+    ]
+):
+    source_layer, (source_feature,) = preset_features_layer_factory(
+        "source", ["LINESTRING(0 0, 1 1)"]
+    )
+    layer1, _ = preset_features_layer_factory(
+        "l1", ["LINESTRING(3 0, 0 3)"]  # not touching
+    )
+
+    layer1.startEditing()
+    layer1.addFeature(
+        QgsVectorLayerUtils.createFeature(
+            layer1, QgsGeometry.fromWkt("LINESTRING(1 0, 0 1)")
+        )
+    )
+
+    (_, temporary_feature), *_ = find_related_features(
+        source_layer, source_feature, candidate_layers=[layer1]
+    )
+
+    assert layer1.commitChanges()
+
+    results = find_related_features(
+        source_layer, source_feature, candidate_layers=[layer1]
+    )
+
+    assert len(results) == 1
+    (_, committed_feature), *_ = results
+    assert committed_feature.id() != temporary_feature.id()
+    assert layer1.getFeature(committed_feature.id()).isValid()
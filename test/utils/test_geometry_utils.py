@@ -1,6 +1,6 @@
 import pytest
 from qgis.core import QgsGeometry, QgsPoint
-from segment_reshape.utils import vertices
+from segment_reshape.utils import clone_geometry_safely, vertices
 
 
 @pytest.mark.parametrize(
@@ -67,3 +67,15 @@ def test_vertices_function_returns_expected_vertex_ids(wkt: str):
     for vertex_id, point in vertices(geometry):
         expected_point = geometry.vertexAt(vertex_id)
         assert point == expected_point
+
+
+def test_clone_geometry_safely_does_not_modify_the_original():
+    original = QgsGeometry.fromWkt("LineString(0 0, 1 0, 2 0)")
+    shared = QgsGeometry(original)
+
+    cloned = clone_geometry_safely(shared)
+    cloned.moveVertex(QgsPoint(5, 5), 1)
+
+    assert shared.asWkt() == "LineString (0 0, 1 0, 2 0)"
+    assert original.asWkt() == "LineString (0 0, 1 0, 2 0)"
+    assert cloned.asWkt() == "LineString (0 0, 5 5, 2 0)"